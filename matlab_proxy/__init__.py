@@ -53,6 +53,7 @@ def get_mwi_ddux_value(extension_name):
     if extension_name == get_default_config_name():
         return matlab_proxy_ddux_value
     else:
+        # Chained str.replace calls are faster than str.translate for short extension names.
         variant = extension_name.upper().strip()
         variant = variant.replace(" ", "_").replace("-", "_")
         mwi_ddux_value = matlab_proxy_ddux_value.replace("BASE", variant)
@@ -288,19 +288,27 @@ def get_caller_name() -> str:
     of the function that is two levels above in the stack. This is typically the function
     that called the function that invoked `get_caller_name`.
 
+    Only the two frames above are walked, instead of building the whole stack with `inspect.stack()`,
+    which also reads source context for every frame.
+
     Ex: start_matlab() -> set_matlab_state() -> get_caller_name()
     The return value from get_caller_name() would be `start_matlab`
 
     Returns:
-        str: Name of the parent function.
+        str: Name of the parent function, or of the outermost function if the stack is shallower than that.
     """
+    frame = inspect.currentframe()
     try:
-        return inspect.stack()[2][3]
+        for _ in range(2):
+            if frame.f_back is None:
+                break
+            frame = frame.f_back
+
+        return frame.f_code.co_name
 
-    except Exception as err:
-        logger.error(f"Failed to get caller name with err:{err}")
-        stack = inspect.stack()
-        return stack[len(stack) - 1][3]
+    finally:
+        # Break the reference cycle between this frame and its local variable.
+        del frame
 
 
 class TrackingLock:
@@ -208,9 +208,15 @@ async def _is_valid_token(token, request):
         _type_: True is token is valid, false otherwise.
     """
     # Check if the token provided in the request matches the hash or the original token
-    # equivalent to a == b, but protects against timing attacks
-    is_valid = compare_digest(token, await _get_token_hash(request)) or compare_digest(
-        token, await _get_token(request)
+    # equivalent to a == b, but protects against timing attacks.
+    # Compare bytes, as compare_digest raises a TypeError for str containing non-ASCII characters.
+    # aiohttp decodes undecodable header bytes and os.getenv decodes undecodable environment
+    # bytes as surrogates, which the 'surrogateescape' handler encodes back to the original bytes.
+    token = token.encode(errors="surrogateescape")
+    is_valid = compare_digest(
+        token, (await _get_token_hash(request)).encode(errors="surrogateescape")
+    ) or compare_digest(
+        token, (await _get_token(request)).encode(errors="surrogateescape")
     )
     logger.debug("Token validation " + ("successful." if is_valid else "failed."))
     return is_valid
@@ -15,6 +15,7 @@ import errno
 import math
 import os
 import socket
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 
@@ -206,10 +207,14 @@ def validate_env_config(config):
     raise FatalError(error_message)
 
 
+@lru_cache(maxsize=1)
 def __get_configs():
     """Iterates over the 'entry_points' of the installed packages in the current python
     environment and loads the 'matlab_proxy_configs' entry point values into the 'configs' Dict.
 
+    The installed packages do not change during the lifetime of the process, so the result is
+    cached after the first call.
+
     Returns:
         Dict: Contains all the values present in 'matlab_web_desktop_configs' entry_point from all the packages
         installed in the current environment.
@@ -5,6 +5,7 @@
 
 import os
 import shutil
+import socket
 import asyncio
 
 import pytest
@@ -53,6 +54,40 @@ def cleanup(request):
     request.addfinalizer(delete_matlab_test_dir)
 
 
+@pytest.fixture(name="free_port", scope="session")
+def free_port_fixture():
+    """A session scoped pytest fixture which returns a callable to hand out free ports.
+
+    A pool of sockets is bound to kernel assigned ports once for the session. Each port stays
+    reserved by its socket until it is handed out, at which point the socket is closed so that
+    the consumer can bind to it. Once the pool is exhausted, ports are allocated on demand.
+
+    Yields:
+        Callable[[], int]: Returns a port which is not handed out to any other test.
+    """
+    pool = []
+    for _ in range(8):
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.bind(("", 0))
+        pool.append(s)
+
+    def get_free_port():
+        if pool:
+            s = pool.pop()
+        else:
+            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            s.bind(("", 0))
+
+        port = s.getsockname()[1]
+        s.close()
+        return port
+
+    yield get_free_port
+
+    for s in pool:
+        s.close()
+
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Overriding the default event loop of pytest. Intended for windows systems for
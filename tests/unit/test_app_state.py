@@ -1,18 +1,22 @@
 # Copyright 2023-2024 The MathWorks, Inc.
 
 import asyncio
+import io
 import json
 import os
 from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional
 
 import pytest
-from matlab_proxy import settings
 
 from matlab_proxy import settings
 from matlab_proxy.app_state import AppState
 from matlab_proxy.constants import MWI_AUTH_TOKEN_NAME_FOR_HTTP
+from matlab_proxy.util.mwi.embedded_connector import (
+    request as embedded_connector_request,
+)
 from matlab_proxy.util.mwi.exceptions import LicensingError, MatlabError
 from matlab_proxy.constants import (
     CONNECTOR_SECUREPORT_FILENAME,
@@ -22,38 +26,82 @@ from matlab_proxy.constants import (
 from tests.unit.util import MockResponse
 from tests.unit.test_constants import CHECK_MATLAB_STATUS_INTERVAL, FIVE_MAX_TRIES
 
+SAMPLE_TOKEN_NAME = MWI_AUTH_TOKEN_NAME_FOR_HTTP
+SAMPLE_TOKEN_HASH = "asdf"
+SAMPLE_TOKEN_HEADERS = {SAMPLE_TOKEN_NAME: SAMPLE_TOKEN_HASH}
+
+
+@pytest.fixture(scope="session")
+def sample_settings_base_fixture():
+    """A session scoped pytest fixture which returns the settings for the AppState class
+    which do not change between tests.
+
+    Returns:
+        MappingProxyType: A read-only mapping of sample settings
+    """
+    return MappingProxyType(
+        {
+            "error": None,
+            "is_xvfb_available": True,
+            "mwi_server_url": "dummy",
+            "mwi_logs_root_dir": Path(settings.get_mwi_config_folder(dev=True)),
+            "app_port": 12345,
+            "mwapikey": "asdf",
+            "has_custom_code_to_execute": False,
+            "mwi_idle_timeout": None,
+            "mwi_is_token_auth_enabled": False,
+            "integration_name": "MATLAB Desktop",
+        }
+    )
+
 
 @pytest.fixture
-def sample_settings_fixture(tmp_path):
+def sample_settings_fixture(sample_settings_base_fixture, tmp_path):
     """A pytest fixture which returns a dict containing sample settings for the AppState class.
 
     Args:
+        sample_settings_base_fixture (MappingProxyType): Settings shared across the session
         tmp_path : Builtin pytest fixture
 
     Returns:
         dict: A dictionary of sample settings
     """
-    tmp_file = tmp_path / "parent_1" / "parent_2" / "tmp_file.json"
-    return {
-        "error": None,
-        "warnings": [],
-        "matlab_config_file": tmp_file,
-        "is_xvfb_available": True,
-        "mwi_server_url": "dummy",
-        "mwi_logs_root_dir": Path(settings.get_mwi_config_folder(dev=True)),
-        "app_port": 12345,
-        "mwapikey": "asdf",
-        "has_custom_code_to_execute": False,
-        "mwi_idle_timeout": 100,
-        "mwi_is_token_auth_enabled": False,
-        "integration_name": "MATLAB Desktop",
-    }
+    sample_settings = dict(sample_settings_base_fixture)
+    sample_settings["warnings"] = []
+    sample_settings["matlab_config_file"] = (
+        tmp_path / "parent_1" / "parent_2" / "tmp_file.json"
+    )
+    return sample_settings
+
+
+def create_app_state(settings, loop):
+    """Yields an instance of AppState class and stops its server tasks once the test is done.
+
+    Args:
+        settings (dict): Settings for the AppState class
+        loop : Event loop on which the server tasks are stopped
+
+    Yields:
+        AppState: An object of the AppState class
+    """
+    app_state = AppState(settings=settings)
+    app_state.processes = {"matlab": None, "xvfb": None}
+    app_state.licensing = {"type": "existing_license"}
+
+    yield app_state
+
+    # server_tasks is not created when AppState is initialized with an error.
+    if getattr(app_state, "server_tasks", None):
+        loop.run_until_complete(app_state.stop_server_tasks())
 
 
 @pytest.fixture
 def app_state_fixture(sample_settings_fixture, loop):
     """A pytest fixture which returns an instance of AppState class with no errors.
 
+    The IDLE timer is disabled so that its task does not run in the background of tests
+    which do not need it. Use app_state_with_idle_timer_fixture for those which do.
+
     Args:
         sample_settings_fixture (dict): A dictionary of sample settings to be used by
         loop : A pytest builtin fixture
@@ -61,24 +109,43 @@ def app_state_fixture(sample_settings_fixture, loop):
     Returns:
         AppState: An object of the AppState class
     """
-    app_state = AppState(settings=sample_settings_fixture)
-    app_state.processes = {"matlab": None, "xvfb": None}
-    app_state.licensing = {"type": "existing_license"}
+    yield from create_app_state(sample_settings_fixture, loop)
 
-    yield app_state
 
-    loop.run_until_complete(app_state.stop_server_tasks())
+@pytest.fixture
+def app_state_with_idle_timer_fixture(sample_settings_fixture, loop):
+    """A pytest fixture which returns an instance of AppState class with the IDLE timer enabled.
+
+    Args:
+        sample_settings_fixture (dict): A dictionary of sample settings to be used by
+        loop : A pytest builtin fixture
+
+    Returns:
+        AppState: An object of the AppState class
+    """
+    sample_settings_fixture["mwi_idle_timeout"] = 100
+    yield from create_app_state(sample_settings_fixture, loop)
 
 
 @pytest.fixture
-def sample_token_headers_fixture():
-    return {MWI_AUTH_TOKEN_NAME_FOR_HTTP: "asdf"}
+def bare_app_state_fixture():
+    """A pytest fixture which returns an instance of AppState class without running its constructor.
+
+    Intended for tests which only exercise methods operating on licensing and error state,
+    so that no server tasks or locks are created and no teardown is required.
+
+    Returns:
+        AppState: An object of the AppState class with only licensing and error set
+    """
+    app_state = AppState.__new__(AppState)
+    app_state.licensing = None
+    app_state.error = None
+
+    return app_state
 
 
 @pytest.fixture
-def app_state_with_token_auth_fixture(
-    app_state_fixture, sample_token_headers_fixture, tmp_path
-):
+def app_state_with_token_auth_fixture(app_state_fixture, tmp_path):
     """Pytest fixture which returns AppState instance with token authentication enabled.
 
     Args:
@@ -90,48 +157,101 @@ def app_state_with_token_auth_fixture(
     """
     tmp_matlab_ready_file = Path(tmp_path) / "tmp_file.txt"
     tmp_matlab_ready_file.touch()
-    ((mwi_auth_token_name, mwi_auth_token_hash),) = sample_token_headers_fixture.items()
     app_state_fixture.matlab_session_files["matlab_ready_file"] = tmp_matlab_ready_file
     app_state_fixture.settings["mwi_is_token_auth_enabled"] = True
-    app_state_fixture.settings["mwi_auth_token_name_for_env"] = mwi_auth_token_name
+    app_state_fixture.settings["mwi_auth_token_name_for_env"] = SAMPLE_TOKEN_NAME
     app_state_fixture.settings["mwi_auth_token_name_for_http"] = (
         MWI_AUTH_TOKEN_NAME_FOR_HTTP
     )
-    app_state_fixture.settings["mwi_auth_token_hash"] = mwi_auth_token_hash
+    app_state_fixture.settings["mwi_auth_token_hash"] = SAMPLE_TOKEN_HASH
     app_state_fixture.settings["mwi_server_url"] = "http://localhost:8888"
 
     return app_state_fixture
 
 
 @pytest.fixture
-def mocker_os_patching_fixture(mocker, platform, loop):
+def fake_asyncio_sleep_fixture(monkeypatch):
+    """A pytest fixture which replaces asyncio.sleep with a fake which does not wait on the wall clock.
+
+    The fake only yields control to the event loop once, which gives the tasks started by
+    AppState (which sleep between iterations) a chance to run an iteration per call.
+
+    Args:
+        monkeypatch : Built-in pytest fixture
+    """
+    real_sleep = asyncio.sleep
+
+    async def fake_sleep(delay, result=None):
+        await real_sleep(0)
+        return result
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+
+
+@pytest.fixture
+def in_memory_files_fixture(monkeypatch):
+    """A pytest fixture which redirects files opened by the app_state module to memory.
+
+    Args:
+        monkeypatch : Built-in pytest fixture
+
+    Returns:
+        dict: Contents of the files written by the app_state module, keyed by path
+    """
+    files = {}
+
+    class InMemoryFile(io.StringIO):
+        def __init__(self, path):
+            super().__init__()
+            self.path = path
+
+        def close(self):
+            files[self.path] = self.getvalue()
+            super().close()
+
+    monkeypatch.setattr(
+        "matlab_proxy.app_state.open",
+        lambda path, *args, **kwargs: InMemoryFile(path),
+        raising=False,
+    )
+
+    return files
+
+
+@pytest.fixture
+def mocker_os_patching_fixture(mocker, monkeypatch, platform, loop):
     """A pytest fixture which patches the is_* functions in system.py module
 
+    The functions are replaced with plain lambdas through monkeypatch as no call tracking is needed.
+
     Args:
         mocker : Built in pytest fixture
+        monkeypatch : Built in pytest fixture
         platform (str): A string representing "windows", "linux" or "mac"
         loop : A pytest builtin fixture
 
     Returns:
-        mocker: Built in pytest fixture with patched calls to system.py module.
+        mocker: Built in pytest fixture, for tests which need to spy on or patch further calls.
     """
-    mocker.patch("matlab_proxy.app_state.system.is_linux", return_value=False)
-    mocker.patch("matlab_proxy.app_state.system.is_windows", return_value=False)
-    mocker.patch("matlab_proxy.app_state.system.is_mac", return_value=False)
-    mocker.patch("matlab_proxy.app_state.system.is_posix", return_value=False)
-    mocker.patch("matlab_proxy.app_state.util.get_event_loop", return_value=loop)
-
-    if platform == "linux":
-        mocker.patch("matlab_proxy.app_state.system.is_linux", return_value=True)
-        mocker.patch("matlab_proxy.app_state.system.is_posix", return_value=True)
-
-    elif platform == "windows":
-        mocker.patch("matlab_proxy.app_state.system.is_windows", return_value=True)
-        mocker.patch("matlab_proxy.app_state.system.is_posix", return_value=False)
+    platform_flags = {
+        "is_linux": False,
+        "is_windows": False,
+        "is_mac": False,
+        "is_posix": False,
+    }
+    platform_flags.update(
+        {
+            "linux": {"is_linux": True, "is_posix": True},
+            "windows": {"is_windows": True},
+            "mac": {"is_mac": True, "is_posix": True},
+        }[platform]
+    )
 
-    else:
-        mocker.patch("matlab_proxy.app_state.system.is_mac", return_value=True)
-        mocker.patch("matlab_proxy.app_state.system.is_posix", return_value=True)
+    for function_name, value in platform_flags.items():
+        monkeypatch.setattr(
+            f"matlab_proxy.app_state.system.{function_name}", lambda value=value: value
+        )
+    monkeypatch.setattr("matlab_proxy.app_state.util.get_event_loop", lambda: loop)
 
     return mocker
 
@@ -161,184 +281,245 @@ class Mock_matlab:
 @pytest.mark.parametrize(
     "licensing, expected",
     [
-        (None, False),
-        ({"type": "nlm", "conn_str": "123@host"}, True),
-        ({"type": "nlm"}, False),
-        ({"type": "mhlm", "identity_token": "random_token"}, False),
-        (
-            {
-                "type": "mhlm",
-                "identity_token": "random_token",
-                "source_id": "dummy_id",
-                "expiry": "Jan 1, 1970",
-                "entitlement_id": "123456",
-            },
+        pytest.param(None, False, id="None licensing"),
+        pytest.param(
+            MappingProxyType({"type": "nlm", "conn_str": "123@host"}),
             True,
+            id="happy path-nlm",
+        ),
+        pytest.param(
+            MappingProxyType({"type": "nlm"}), False, id="incomplete nlm data"
+        ),
+        pytest.param(
+            MappingProxyType({"type": "mhlm", "identity_token": "random_token"}),
+            False,
+            id="incomplete mhlm data",
+        ),
+        pytest.param(
+            MappingProxyType(
+                {
+                    "type": "mhlm",
+                    "identity_token": "random_token",
+                    "source_id": "dummy_id",
+                    "expiry": "Jan 1, 1970",
+                    "entitlement_id": "123456",
+                }
+            ),
+            True,
+            id="happy path-mhlm",
+        ),
+        pytest.param(
+            MappingProxyType({"type": "existing_license"}),
+            True,
+            id="happy path-existing license",
+        ),
+        pytest.param(
+            MappingProxyType({"type": "invalid_type"}), False, id="invalid license"
         ),
-        ({"type": "existing_license"}, True),
-        ({"type": "invalid_type"}, False),
-    ],
-    ids=[
-        "None licensing",
-        "happy path-nlm",
-        "incomplete nlm data",
-        "incomplete mhlm data",
-        "happy path-mhlm",
-        "happy path-existing license",
-        "invalid license",
     ],
 )
-def test_is_licensed(app_state_fixture, licensing, expected):
+def test_is_licensed(bare_app_state_fixture, licensing, expected):
     """Test to check is_licensed()
 
+    The licensing data is wrapped in a read-only MappingProxyType so that any accidental
+    mutation of the shared parametrize data fails loudly.
+
     Args:
-        app_state_fixture (AppState): Object of AppState class with defaults set
-        licensing (dict): Represents licensing information
+        bare_app_state_fixture (AppState): Object of AppState class with only licensing and error set
+        licensing (MappingProxyType): Represents licensing information
         expected (bool): Expected return value.
     """
     # Arrange
     # Nothing to arrange
 
     # Act
-    app_state_fixture.licensing = licensing
+    bare_app_state_fixture.licensing = licensing
 
     # Assert
-    assert app_state_fixture.is_licensed() == expected
+    assert bare_app_state_fixture.is_licensed() == expected
 
 
 @pytest.mark.parametrize(
     "err, expected_err",
     [
-        (MatlabError(message="dummy error"), MatlabError(message="dummy")),
-        (LicensingError(message="license issue"), None),
+        pytest.param(
+            MatlabError(message="dummy error"),
+            MatlabError(message="dummy"),
+            id="Any error except licensing error",
+        ),
+        pytest.param(
+            LicensingError(message="license issue"), None, id="licensing error"
+        ),
     ],
-    ids=["Any error except licensing error", "licensing error"],
 )
-def test_unset_licensing(err, app_state_fixture, expected_err):
+def test_unset_licensing(err, bare_app_state_fixture, expected_err):
     """Test to check unset_liecnsing removes licensing from the AppState object
 
     Args:
         err (Exception): Custom exceptions defined in exceptions.py
-        licensing (bool): Whether licensing info is removed
+        bare_app_state_fixture (AppState): Object of AppState class with only licensing and error set
         expected_err (Exception): Expected exception
     """
     # Arrange
-    app_state_fixture.error = err
+    bare_app_state_fixture.licensing = {"type": "existing_license"}
+    bare_app_state_fixture.error = err
 
     # Act
-    app_state_fixture.unset_licensing()
+    bare_app_state_fixture.unset_licensing()
 
     # Assert
-    assert app_state_fixture.licensing == None
-    assert type(app_state_fixture.error) is type(expected_err)
+    assert bare_app_state_fixture.licensing == None
+    assert type(bare_app_state_fixture.error) is type(expected_err)
 
 
 # config file is deleted when licensing info is not set i.e. set to None
-def test_persist_licensing_when_licensing_info_is_not_set(app_state_fixture):
+def test_persist_licensing_when_licensing_info_is_not_set(bare_app_state_fixture):
     """Test to check if data is not persisted to a file if licensing info is not present
 
+    The config file is never written, so a path which does not exist is used instead of
+    creating a temporary directory for this test.
+
     Args:
-        tmp_path (Path): Built in pytest fixture
+        bare_app_state_fixture (AppState): Object of AppState class with only licensing and error set
     """
     # Arrange
-    # Nothing to arrange
-    app_state_fixture.licensing = None
+    bare_app_state_fixture.settings = {
+        "matlab_config_file": Path("/nonexistent") / "__should_not_exist__.json"
+    }
 
     # Act
-    app_state_fixture.persist_config_data()
+    bare_app_state_fixture.persist_config_data()
 
     # Assert
-    assert os.path.exists(app_state_fixture.settings["matlab_config_file"]) is False
+    assert (
+        os.path.exists(bare_app_state_fixture.settings["matlab_config_file"]) is False
+    )
 
 
 @pytest.mark.parametrize(
     "licensing_data",
     [
-        ({"type": "nlm", "conn_str": "123@host"}),
-        (
+        pytest.param({"type": "nlm", "conn_str": "123@host"}, id="nlm type"),
+        pytest.param(
             {
                 "type": "mhlm",
                 "identity_token": "random_token",
                 "source_id": "dummy_id",
                 "expiry": "Jan 1, 1970",
                 "entitlement_id": "123456",
-            }
+            },
+            id="mhlm type",
         ),
-        ({"type": "existing_license"}),
+        pytest.param({"type": "existing_license"}, id="existing license type"),
     ],
-    ids=["nlm type", "mhlm type", "existing license type"],
 )
-def test_persist_config_data(licensing_data: dict, tmp_path):
-    """Test to check if persist_licensing() writes data to the file system
+def test_persist_config_data(
+    bare_app_state_fixture, licensing_data: dict, in_memory_files_fixture, mocker
+):
+    """Test to check if persist_licensing() writes data to the config file
+
+    The config file is written to memory. test_persist_config_data_writes_to_file_system
+    covers writing to the file system.
+
+    Args:
+        bare_app_state_fixture (AppState): Object of AppState class with only licensing and error set
+        licensing_data (dict): Represents matlab-proxy licensing data
+        in_memory_files_fixture (dict): Contents of the files written by app_state, keyed by path
+        mocker : Built-in pytest fixture
+    """
+    # Arrange
+    config_file = mocker.MagicMock(spec=Path)
+    bare_app_state_fixture.settings = {
+        "matlab_config_file": config_file,
+        "matlab_version": None,
+    }
+    bare_app_state_fixture.licensing = licensing_data
+
+    cached_data = {"licensing": licensing_data, "matlab": {"version": None}}
+
+    # Act
+    bare_app_state_fixture.persist_config_data()
+
+    # Assert
+    config_file.parent.mkdir.assert_called_once_with(parents=True, exist_ok=True)
+    assert json.loads(in_memory_files_fixture[config_file]) == cached_data
+
+
+def test_persist_config_data_writes_to_file_system(bare_app_state_fixture, tmp_path):
+    """Test to check if persist_licensing() creates the parent directories and writes data to the file system
 
     Args:
-        data (dict): Represents matlab-proxy licensing data
+        bare_app_state_fixture (AppState): Object of AppState class with only licensing and error set
         tmp_path : Built-in pytest fixture.
     """
     # Arrange
     tmp_file = tmp_path / "parent_1" / "parent_2" / "tmp_file.json"
-    settings = {
+    bare_app_state_fixture.settings = {
         "matlab_config_file": tmp_file,
-        "error": None,
         "matlab_version": None,
-        "warnings": [],
-        "mwi_idle_timeout": None,
     }
-    app_state = AppState(settings=settings)
-    app_state.licensing = licensing_data
+    bare_app_state_fixture.licensing = {"type": "existing_license"}
 
-    cached_data = {"licensing": licensing_data, "matlab": {"version": None}}
+    cached_data = {
+        "licensing": bare_app_state_fixture.licensing,
+        "matlab": {"version": None},
+    }
 
     # Act
-    app_state.persist_config_data()
+    bare_app_state_fixture.persist_config_data()
     with open(tmp_file, "r") as file:
-        got = file.read()
+        got = json.load(file)
 
     # Assert
-    assert json.loads(got) == cached_data
+    assert got == cached_data
 
 
+# Frozen, so a single instance of each running process is shared by all tests.
+RUNNING_MOCK_MATLAB = Mock_matlab(None, 1)
+RUNNING_MOCK_XVFB = Mock_xvfb(None, 1)
+
 validate_required_processes_test_data = [
-    (None, None, "linux", False),  # xvfb is None == True
-    (None, Mock_xvfb(None, 1), "linux", False),  # matlab is None == True
-    (
-        Mock_matlab(None, 1),
-        Mock_xvfb(None, 1),
+    # xvfb is None == True
+    pytest.param(None, None, "linux", False, id="processes_not_running"),
+    # matlab is None == True
+    pytest.param(None, RUNNING_MOCK_XVFB, "linux", False, id="matlab_not_running"),
+    # All branches are skipped and nothing returned
+    pytest.param(
+        RUNNING_MOCK_MATLAB,
+        RUNNING_MOCK_XVFB,
         "linux",
         True,
-    ),  # All branches are skipped and nothing returned
-    (
-        Mock_matlab(None, 1),
+        id="All_required_processes_running",
+    ),
+    # xvfb.returncode is not None == True
+    pytest.param(
+        RUNNING_MOCK_MATLAB,
         Mock_xvfb(123, 2),
         "linux",
         False,
-    ),  # xvfb.returncode is not None == True
-    (
+        id="All_processes_running_with_xvfb_returning_non_zero_code",
+    ),
+    # matlab.returncode is not None == True
+    pytest.param(
         Mock_matlab(123, 1),
         Mock_xvfb(None, 2),
         "linux",
         False,
-    ),  # matlab.returncode is not None == True
-    (
-        Mock_matlab(None, 1),
+        id="All_processes_running_with_matlab_returning_non_zero_code",
+    ),
+    # Xvfb not found on path
+    pytest.param(
+        RUNNING_MOCK_MATLAB,
         None,
         "linux",
         True,
-    ),  # Xvfb not found on path
+        id="xvfb_is_optional_matlab_starts_without_it",
+    ),
 ]
 
 
 @pytest.mark.parametrize(
-    "matlab, xvfb, platform, expected",
-    validate_required_processes_test_data,
-    ids=[
-        "processes_not_running",
-        "matlab_not_running",
-        "All_required_processes_running",
-        "All_processes_running_with_xvfb_returning_non_zero_code",
-        "All_processes_running_with_matlab_returning_non_zero_code",
-        "xvfb_is_optional_matlab_starts_without_it",
-    ],
+    "matlab, xvfb, platform, expected", validate_required_processes_test_data
 )
 def test_are_required_processes_ready(
     app_state_fixture, mocker_os_patching_fixture, matlab, xvfb, expected
@@ -415,7 +596,8 @@ async def test_track_embedded_connector_posix(
     spy.assert_called_once()
 
 
-@pytest.mark.parametrize("platform", [("windows")])
+@pytest.mark.slow
+@pytest.mark.parametrize("platform", ["windows"])
 async def test_track_embedded_connector(mocker_os_patching_fixture, app_state_fixture):
     """Test to check track_embedded_connector task on windows.
 
@@ -473,27 +655,27 @@ async def test_track_embedded_connector(mocker_os_patching_fixture, app_state_fi
     ids=["env_var_is_filtered", "env_var_is_not_filtered"],
 )
 def test_env_variables_filtration_for_xvfb_process(
-    monkeypatch, env_var_name, filter_prefix, is_filtered
+    env_var_name, filter_prefix, is_filtered
 ):
     """Test to check if __filter_env_variables filters environment variables with a certain prefix correctly.
 
+    A minimal environment is passed instead of os.environ so that only the variables of interest are filtered.
+
     Args:
-        monkeypatch (Object): Built-in pytest fixture for monkeypatching
         env_var_name (str): Name of the environment variable
         filter_prefix (str): Prefix to check for filtering
         is_filtered (bool): To check if the env variable with specified prefix is filtered.
     """
     # Arrange
-    env_var = env_var_name
-    monkeypatch.setenv(env_var, "foo")
+    env_vars = {env_var_name: "foo", "PATH": os.defpath}
 
     # Act
     filtered_env_vars: dict = AppState._AppState__filter_env_variables(
-        os.environ, filter_prefix
+        env_vars, filter_prefix
     )
 
     # Assert
-    assert filtered_env_vars.get(env_var) == is_filtered
+    assert filtered_env_vars.get(env_var_name) == is_filtered
 
 
 @pytest.mark.parametrize(
@@ -529,7 +711,7 @@ async def test_setup_env_for_matlab(
 
 async def test_requests_sent_by_matlab_proxy_have_headers(
     app_state_with_token_auth_fixture,
-    sample_token_headers_fixture,
+    fake_asyncio_sleep_fixture,
     mocker,
 ):
     """Test to check if token headers are included in requests sent by matlab-proxy when authentication is enabled.
@@ -537,7 +719,7 @@ async def test_requests_sent_by_matlab_proxy_have_headers(
 
     Args:
         app_state_fixture_with_token_auth (AppState): Instance of AppState class with token authentication enabled
-        sample_token_headers_fixture (dict): Dict which represents the token headers
+        fake_asyncio_sleep_fixture : Custom pytest fixture which makes asyncio.sleep return immediately
         mocker : Built-in pytest fixture
     """
     # Arrange
@@ -546,20 +728,15 @@ async def test_requests_sent_by_matlab_proxy_have_headers(
     )
     mocked_req = mocker.patch("aiohttp.ClientSession.request", return_value=mock_resp)
 
-    # Patching to make _are_required_processes_ready() to return True
-    mocker.patch.object(
-        AppState,
-        "_are_required_processes_ready",
-        return_value=True,
-    )
-    # Patching to make get_matlab_state() to return up
-    mocker.patch.object(
-        AppState,
-        "get_matlab_state",
-        return_value="up",
+    # Patching to make _are_required_processes_ready() to return True and
+    # get_matlab_state() to return up
+    mocker.patch.multiple(
+        app_state_with_token_auth_fixture,
+        _are_required_processes_ready=mocker.MagicMock(return_value=True),
+        get_matlab_state=mocker.MagicMock(return_value="up"),
     )
-    # Wait for _update_matlab_connector_status to run
-    await asyncio.sleep(CHECK_MATLAB_STATUS_INTERVAL)
+    # Yield to the event loop so that _update_matlab_connector_status runs.
+    await asyncio.sleep(0)
 
     # Act
     await app_state_with_token_auth_fixture._AppState__send_stop_request_to_matlab()
@@ -574,8 +751,8 @@ async def test_requests_sent_by_matlab_proxy_have_headers(
     send_stop_matlab_request_headers = list(mocked_req.call_args_list)[1].kwargs[
         "headers"
     ]
-    assert sample_token_headers_fixture == connector_status_request_headers
-    assert sample_token_headers_fixture == send_stop_matlab_request_headers
+    assert SAMPLE_TOKEN_HEADERS == connector_status_request_headers
+    assert SAMPLE_TOKEN_HEADERS == send_stop_matlab_request_headers
 
 
 async def test_start_matlab_without_xvfb(app_state_fixture, mocker):
@@ -587,19 +764,16 @@ async def test_start_matlab_without_xvfb(app_state_fixture, mocker):
     """
     # Arrange
     app_state_fixture.settings["is_xvfb_available"] = False
-    mock_matlab = Mock_matlab(None, 1)
+    mock_matlab = RUNNING_MOCK_MATLAB
 
     # Starting asyncio tasks related to matlab is not required here as only Xvfb check is required.
-    mocker.patch.object(
-        AppState, "_AppState__start_matlab_process", return_value=mock_matlab
-    )
-    mocker.patch.object(
-        AppState, "_AppState__matlab_stderr_reader_posix", return_value=None
-    )
-    mocker.patch.object(
-        AppState, "_AppState__track_embedded_connector_state", return_value=None
+    mocker.patch.multiple(
+        AppState,
+        _AppState__start_matlab_process=mocker.AsyncMock(return_value=mock_matlab),
+        _AppState__matlab_stderr_reader_posix=mocker.AsyncMock(return_value=None),
+        _AppState__track_embedded_connector_state=mocker.AsyncMock(return_value=None),
+        _AppState__update_matlab_port=mocker.AsyncMock(return_value=None),
     )
-    mocker.patch.object(AppState, "_AppState__update_matlab_port", return_value=None)
 
     # Act
     await app_state_fixture.start_matlab()
@@ -716,11 +890,11 @@ def test_create_logs_dir_for_MATLAB(
     assert len(app_state_fixture.matlab_session_files) == session_file_count
 
 
-async def test_check_idle_timer_started(app_state_fixture):
+async def test_check_idle_timer_started(app_state_with_idle_timer_fixture):
     """Test to check if the IDLE timer starts automatically
 
     Args:
-        app_state_fixture (AppState): Object of AppState class with defaults set
+        app_state_with_idle_timer_fixture (AppState): Object of AppState class with the IDLE timer enabled
     """
     # Arrange
     # Nothing to arrange
@@ -729,65 +903,73 @@ async def test_check_idle_timer_started(app_state_fixture):
     # constructor is called automatically
 
     # Assert
-    assert app_state_fixture.is_idle_timeout_enabled is True
-    assert "decrement_idle_timer" in app_state_fixture.server_tasks
-    assert app_state_fixture.idle_timeout_lock is not None
+    assert app_state_with_idle_timer_fixture.is_idle_timeout_enabled is True
+    assert "decrement_idle_timer" in app_state_with_idle_timer_fixture.server_tasks
+    assert app_state_with_idle_timer_fixture.idle_timeout_lock is not None
 
 
-async def test_reset_timer(app_state_fixture):
+async def test_reset_timer(
+    app_state_with_idle_timer_fixture, fake_asyncio_sleep_fixture
+):
     """Test to check if the IDLE timer is reset to its initial value
 
     Args:
-        app_state_fixture (AppState): Object of AppState class with defaults set
+        app_state_with_idle_timer_fixture (AppState): Object of AppState class with the IDLE timer enabled
+        fake_asyncio_sleep_fixture : Custom pytest fixture which makes asyncio.sleep return immediately
     """
     # Arrange
-    # Sleep for 1 second for the decrement_timer task to decrease IDLE timer by
-    # more than 1 second. This is for decreasing flakiness of this test on different platforms.
-    await asyncio.sleep(CHECK_MATLAB_STATUS_INTERVAL + CHECK_MATLAB_STATUS_INTERVAL)
+    # Yield to the event loop so that the decrement_timer task decreases the IDLE timer.
+    await asyncio.sleep(0)
 
     # Act
-    await app_state_fixture.reset_timer()
+    await app_state_with_idle_timer_fixture.reset_timer()
 
     # Assert
     assert (
-        app_state_fixture.get_remaining_idle_timeout()
-        == app_state_fixture.settings["mwi_idle_timeout"]
+        app_state_with_idle_timer_fixture.get_remaining_idle_timeout()
+        == app_state_with_idle_timer_fixture.settings["mwi_idle_timeout"]
     )
 
 
-async def test_decrement_timer(app_state_fixture):
+async def test_decrement_timer(
+    app_state_with_idle_timer_fixture, fake_asyncio_sleep_fixture
+):
     """Test to check if the IDLE timer value decrements automatically
 
     Args:
-        app_state_fixture (AppState): Object of AppState class with defaults set
+        app_state_with_idle_timer_fixture (AppState): Object of AppState class with the IDLE timer enabled
+        fake_asyncio_sleep_fixture : Custom pytest fixture which makes asyncio.sleep return immediately
     """
     # Arrange
     # Nothing to arrange
     # decrement_timer task is started automatically by the constructor
 
-    # Sleep for 1 second for the decrement_timer task to decrease IDLE timer by
-    # more than 1 second. This is for decreasing flakiness of this test on different platforms.
-    await asyncio.sleep(CHECK_MATLAB_STATUS_INTERVAL + CHECK_MATLAB_STATUS_INTERVAL)
+    # Yield to the event loop so that the decrement_timer task decreases the IDLE timer.
+    await asyncio.sleep(0)
 
     # Act
     # Nothing to act
 
     # Assert
     assert (
-        app_state_fixture.get_remaining_idle_timeout()
-        < app_state_fixture.settings["mwi_idle_timeout"]
+        app_state_with_idle_timer_fixture.get_remaining_idle_timeout()
+        < app_state_with_idle_timer_fixture.settings["mwi_idle_timeout"]
     )
 
 
-async def test_decrement_timer_runs_out(sample_settings_fixture, mocker):
+async def test_decrement_timer_runs_out(
+    sample_settings_fixture, fake_asyncio_sleep_fixture, mocker
+):
     """Test to check if the IDLE timer eventually runs out.
 
     Args:
-        app_state_fixture (AppState): Object of AppState class with defaults set
+        sample_settings_fixture (dict): A dictionary of sample settings
+        fake_asyncio_sleep_fixture : Custom pytest fixture which makes asyncio.sleep return immediately
+        mocker : Built-in pytest fixture
     """
     # Arrange
     # Set the IDLE timeout to a low value
-    idle_timeout = 1
+    idle_timeout = 0.05
     sample_settings_fixture["mwi_idle_timeout"] = idle_timeout
     app_state = AppState(settings=sample_settings_fixture)
     app_state.processes = {"matlab": None, "xvfb": None}
@@ -798,9 +980,11 @@ async def test_decrement_timer_runs_out(sample_settings_fixture, mocker):
     mocker.patch("matlab_proxy.app_state.util.get_event_loop", return_value=mock_loop)
 
     # Act
-    # Wait for a little more time than idle_timeout to decrease flakiness of this test on different platforms.
-    # MATLAB state changes from down -> starting -> up -> down (idle timer runs out)
-    await asyncio.sleep(idle_timeout * FIVE_MAX_TRIES)
+    # The decrement_idle_timer task completes as soon as the IDLE timer runs out and MATLAB is stopped.
+    # The timeout only bounds the wait if the timer never runs out.
+    await asyncio.wait_for(
+        app_state.server_tasks["decrement_idle_timer"], timeout=FIVE_MAX_TRIES
+    )
 
     # Assert
     assert not mock_loop.is_running()
@@ -837,68 +1021,90 @@ async def test_update_matlab_state_based_on_connector_state(
 
 
 @pytest.mark.parametrize(
-    "matlab_status, matlab_busy_status",
-    [("starting", None), ("up", "busy"), ("up", "idle")],
-    ids=["No response from busy status endpoint", "MATLAB is busy", "MATLAB is idle"],
+    "endpoint, request_function, response, matlab_status, matlab_busy_status",
+    [
+        pytest.param(
+            "busy_status_endpoint",
+            "get_busy_state",
+            None,
+            "starting",
+            None,
+            id="No response from busy status endpoint",
+        ),
+        pytest.param(
+            "busy_status_endpoint",
+            "get_busy_state",
+            "busy",
+            "up",
+            "busy",
+            id="MATLAB is busy",
+        ),
+        pytest.param(
+            "busy_status_endpoint",
+            "get_busy_state",
+            "idle",
+            "up",
+            "idle",
+            id="MATLAB is idle",
+        ),
+        pytest.param(
+            "ping_endpoint",
+            "get_state",
+            "down",
+            "starting",
+            None,
+            id="ping_endpoint-connector_down",
+        ),
+        pytest.param(
+            "ping_endpoint",
+            "get_state",
+            "up",
+            "up",
+            "busy",
+            id="ping_endpoint-connector_up",
+        ),
+    ],
 )
-async def test_update_matlab_state_using_busy_endpoint(
-    mocker, app_state_fixture, matlab_status, matlab_busy_status
+async def test_update_matlab_state_using_endpoint(
+    mocker,
+    app_state_fixture,
+    endpoint,
+    request_function,
+    response,
+    matlab_status,
+    matlab_busy_status,
 ):
-    """Test to check if MATLAB and its busy status updates correctly when the
-    busy status endpoint is used.
+    """Test to check if MATLAB and its busy status updates correctly when either the
+    busy status endpoint or the ping endpoint is used.
 
     Args:
         mocker (mocker): Built-in pytest fixture
         app_state_fixture (AppState): Object of AppState class with defaults set
+        endpoint (str): Endpoint used to update the MATLAB state
+        request_function (str): Embedded connector request function used by the endpoint
+        response (str): Represents the response of the endpoint
         matlab_status (str): Represents MATLAB status
         matlab_busy_status (str): Represents MATLAB busy status
     """
     # Arrange
-    mocker.patch(
-        "matlab_proxy.app_state.mwi.embedded_connector.request.get_busy_state",
-        return_value=matlab_busy_status,
+    mocker.patch.object(
+        embedded_connector_request,
+        request_function,
+        new=mocker.AsyncMock(return_value=response),
     )
-
-    # Act
-    await app_state_fixture._AppState__update_matlab_state_using_busy_status_endpoint()
-
-    # Assert
-    assert app_state_fixture.get_matlab_state() == matlab_status
-    assert app_state_fixture.matlab_busy_state == matlab_busy_status
-
-
-@pytest.mark.parametrize(
-    "connector_status, matlab_status, matlab_busy_status",
-    [("down", "starting", None), ("up", "up", "busy")],
-    ids=["connector_down", "connector_up"],
-)
-async def test_update_matlab_state_using_ping_endpoint(
-    mocker, app_state_fixture, connector_status, matlab_status, matlab_busy_status
-):
-    """Test to check if MATLAB and its busy status updates correctly when the
-    ping endpoint is used.
-
-    Args:
-        mocker (mocker): Built-in pytest fixture
-        app_state_fixture (AppState): Object of AppState class with defaults set
-        connector_status (str): Represents Connector status
-        matlab_status (str): Represents MATLAB status
-        matlab_busy_status (str): Represents MATLAB busy status
-    """
-    # Arrange
-    mocker.patch(
-        "matlab_proxy.app_state.mwi.embedded_connector.request.get_state",
-        return_value=connector_status,
+    update_matlab_state = getattr(
+        app_state_fixture, f"_AppState__update_matlab_state_using_{endpoint}"
     )
 
     # Act
-    await app_state_fixture._AppState__update_matlab_state_using_ping_endpoint()
+    await update_matlab_state()
 
     # Assert
     assert app_state_fixture.get_matlab_state() == matlab_status
     assert app_state_fixture.matlab_busy_state == matlab_busy_status
 
 
+@pytest.mark.slow
 async def test_update_matlab_state_based_on_endpoint_to_use_required_processes_not_ready(
     mocker, app_state_fixture
 ):
@@ -909,9 +1115,10 @@ async def test_update_matlab_state_based_on_endpoint_to_use_required_processes_n
         app_state_fixture (AppState): Object of AppState class with defaults set
     """
     # Arrange
-    mocker.patch(
-        "matlab_proxy.app_state.mwi.embedded_connector.request.get_state",
-        return_value="up",
+    mocker.patch.object(
+        embedded_connector_request,
+        "get_state",
+        new=mocker.AsyncMock(return_value="up"),
     )
 
     await app_state_fixture._AppState__update_matlab_state_based_on_endpoint_to_use(
@@ -921,6 +1128,7 @@ async def test_update_matlab_state_based_on_endpoint_to_use_required_processes_n
     assert app_state_fixture.get_matlab_state() == "down"
 
 
+@pytest.mark.slow
 async def test_update_matlab_state_based_on_endpoint_to_use_happy_path(
     mocker, tmp_path, app_state_fixture
 ):
@@ -934,7 +1142,7 @@ async def test_update_matlab_state_based_on_endpoint_to_use_happy_path(
     """
     # Arrange
     mocker.patch.object(
-        AppState,
+        app_state_fixture,
         "_are_required_processes_ready",
         return_value=True,
     )
@@ -952,35 +1160,52 @@ async def test_update_matlab_state_based_on_endpoint_to_use_happy_path(
 
 
 async def assert_matlab_state(app_state_fixture, expected_matlab_status, count):
-    """Tries to assert the MATLAB state to expected_matlab_status for count times.
-    Will raise Assertion error after.
+    """Waits for the MATLAB state to change to expected_matlab_status.
+    Will raise Assertion error if it does not change within 'count' status check intervals.
+
+    MATLAB state is only ever updated while the MATLAB state lock is held, so the state is
+    rechecked each time that lock is released instead of polling at a fixed interval.
 
     The count is needed to decrease flakiness of this tests when run on different platforms.
 
     Args:
         app_state_fixture (AppState): Instance of AppState class.
         expected_matlab_status (str): Expected MATLAB status
-        count (int): Max tries for assertion before AssertionError is raised.
+        count (int): Max status check intervals to wait for before AssertionError is raised.
 
     Raises:
-        AssertionError: Raised when assertion fails after 'count' tries
+        AssertionError: Raised when MATLAB state does not change within 'count' intervals
     """
-    i = 0
-    while i < count:
-        try:
-            assert app_state_fixture.get_matlab_state() == expected_matlab_status
-            return
-
-        except:
-            await asyncio.sleep(CHECK_MATLAB_STATUS_INTERVAL)
-
-        i += 1
+    state_lock = app_state_fixture.matlab_state_updater_lock
+    release_state_lock = state_lock.release
+    state_updated = asyncio.Condition()
+
+    async def release_and_notify():
+        await release_state_lock()
+        async with state_updated:
+            state_updated.notify_all()
+
+    state_lock.release = release_and_notify
+    try:
+        async with state_updated:
+            await asyncio.wait_for(
+                state_updated.wait_for(
+                    lambda: app_state_fixture.get_matlab_state()
+                    == expected_matlab_status
+                ),
+                timeout=count * CHECK_MATLAB_STATUS_INTERVAL,
+            )
+
+    except asyncio.TimeoutError:
+        raise AssertionError(
+            f"MATLAB status failed to change to '{expected_matlab_status}'"
+        )
 
-    raise AssertionError(
-        f"MATLAB status failed to change to '{expected_matlab_status}'"
-    )
+    finally:
+        del state_lock.release
 
 
+@pytest.mark.slow
 @pytest.mark.parametrize(
     "matlab_ready_file, expected_matlab_status",
     [
@@ -1005,7 +1230,7 @@ async def test_check_matlab_connector_status_auto_updates_based_on_matlab_ready_
     """
     # Arrange
     mocker.patch.object(
-        AppState,
+        app_state_fixture,
         "_are_required_processes_ready",
         return_value=True,
     )
@@ -1024,6 +1249,7 @@ async def test_check_matlab_connector_status_auto_updates_based_on_matlab_ready_
     await assert_matlab_state(app_state_fixture, expected_matlab_status, FIVE_MAX_TRIES)
 
 
+@pytest.mark.slow
 async def test_update_matlab_state_switches_to_busy_endpoint(
     mocker, tmp_path, app_state_fixture
 ):
@@ -1038,29 +1264,35 @@ async def test_update_matlab_state_switches_to_busy_endpoint(
     # Arrange
     # Setup mocks for the first ping request to be successful
     mocker.patch.object(
-        AppState,
+        app_state_fixture,
         "_are_required_processes_ready",
         return_value=True,
     )
-    mocker.patch(
-        "matlab_proxy.app_state.mwi.embedded_connector.request.get_state",
-        return_value="up",
+    mocker.patch.object(
+        embedded_connector_request,
+        "get_state",
+        new=mocker.AsyncMock(return_value="up"),
     )
     tmp_file = tmp_path / Path("dummy")
     tmp_file.touch()
     app_state_fixture.matlab_session_files["matlab_ready_file"] = tmp_file
+    switched_to_busy_endpoint = asyncio.Event()
+
+    def busy_status_endpoint_stub():
+        if mocked_busy_status_endpoint_function.call_count > 1:
+            switched_to_busy_endpoint.set()
+
     mocked_busy_status_endpoint_function = mocker.patch.object(
-        app_state_fixture, "_AppState__update_matlab_state_using_busy_status_endpoint"
+        app_state_fixture,
+        "_AppState__update_matlab_state_using_busy_status_endpoint",
+        side_effect=busy_status_endpoint_stub,
     )
 
     # Act
     # Nothing to act upon as the _update_matlab_state() is started automatically in the constructor.
-    # Have to wait here for the atleast the same interval as the __update_matlab_state_based_on_endpoint_to_use()
-    # for the MATLAB status to update from 'down'
-
-    # Wait for the ping endpoint request. Waiting for more time than what
-    # is needed to decrease flakiness of this test on different platforms.
-    await asyncio.sleep(1 * FIVE_MAX_TRIES)
+    # Wait until the busy status endpoint has been used more than once. The timeout is kept
+    # larger than what is needed to decrease flakiness of this test on different platforms.
+    await asyncio.wait_for(switched_to_busy_endpoint.wait(), timeout=FIVE_MAX_TRIES)
 
     # Assert
     assert mocked_busy_status_endpoint_function.call_count > 1
@@ -1,6 +1,8 @@
 # Copyright 2020-2024 The MathWorks, Inc.
 
+import asyncio
 import os
+import random
 import socket
 import subprocess
 import sys
@@ -21,74 +23,15 @@ TWO_MAX_TRIES = 2
 FIVE_MAX_TRIES = 5
 HALF_SECOND_DELAY = 0.5
 ONE_SECOND_DELAY = 1
+INITIAL_BACKOFF_DELAY = 0.05
+BACKOFF_FACTOR = 1.3
 
 
-@pytest.fixture(name="matlab_log_dir")
-def matlab_log_dir_fixture(monkeypatch, tmp_path):
-    """A pytest fixture to monkeypatch an environment variable.
+VALID_NLM = "123@nlm"
+INVALID_NLM = "123@brokenhost"
 
-    This fixture monkeypatches MATLAB_LOG_DIR env variable which the
-    fake matlab server utilizes to write the matlab_ready_file into.
 
-    Args:
-        monkeypatch : A built-in pytest fixture.
-        tmp_path: tmp_path fixture provides a temporary directory unique to the test invocation.
-    """
-    hostname = socket.gethostname()
-    matlab_log_dir = Path(tmp_path)
-
-    if hostname:
-        matlab_log_dir = matlab_log_dir / "hosts" / hostname
-        matlab_log_dir.mkdir(parents=True, exist_ok=True)
-
-    monkeypatch.setenv("MATLAB_LOG_DIR", str(matlab_log_dir))
-
-    return matlab_log_dir
-
-
-@pytest.fixture(name="matlab_ready_file")
-def matlab_ready_file_fixture(matlab_log_dir):
-    """A pytest fixture to create the matlab_ready_file.
-
-    This fixture creates the matlab readyfile path based on the matlab_log_dir fixture output.
-
-    Args:
-        matlab_log_dir: pytest fixture that returns a temp dir to be used as matlab_log_dir
-
-    Returns:
-        Path: Returns path of the matlab_ready_file
-    """
-    return Path(f"{matlab_log_dir}/{CONNECTOR_SECUREPORT_FILENAME}")
-
-
-@pytest.fixture(name="valid_nlm")
-def valid_nlm_fixture(monkeypatch):
-    """A pytest fixture to monkeypatch an environment variable.
-
-    This fixture monkeypatches MLM_LICENSE_FILE with a valid NLM connection string.
-
-    Args:
-        monkeypatch : A built-in pytest fixture
-    """
-
-    monkeypatch.setenv(mwi_env.get_env_name_network_license_manager(), "123@nlm")
-
-
-@pytest.fixture(name="invalid_nlm")
-def invalid_nlm_fixture(monkeypatch):
-    """A pytest fixture to monkeypatch an environment variable.
-
-    This fixture monkeypatches MLM_LICENSE_FILE with an invalid NLM connection string.
-
-
-    Args:
-        monkeypatch : A built-in pytest fixture
-    """
-
-    monkeypatch.setenv(mwi_env.get_env_name_network_license_manager(), "123@brokenhost")
-
-
-@pytest.fixture(name="matlab_process_setup")
+@pytest.fixture(name="matlab_process_setup", scope="module")
 def matlab_process_setup_fixture():
     """A pytest fixture which creates a NamedTuple required for creating a fake matlab process
 
@@ -122,119 +65,158 @@ def matlab_process_setup_fixture():
     return variables
 
 
-@pytest.fixture(name="matlab_process_valid_nlm")
-def matlab_process_valid_nlm_fixture(matlab_log_dir, matlab_process_setup, valid_nlm):
-    """A pytest fixture which creates a fake matlab process with a valid NLM connection string.
+@pytest.fixture(name="http_session", scope="module")
+async def http_session_fixture():
+    """A pytest fixture which yields an aiohttp.ClientSession shared by all the tests in this module.
+
+    Reusing a single session avoids setting up a new connector for every request sent to the
+    fake matlab server.
 
-    This  pytest fixture creates a matlab process and yields control to the test which utilizes this
-    fixture. After completion of tests stops the matlab process
+    Yields:
+        aiohttp.ClientSession: Client session used to send requests to the fake matlab server
     """
+    async with aiohttp.ClientSession(trust_env=True) as session:
+        yield session
 
-    matlab_process = subprocess.Popen(
-        matlab_process_setup.matlab_cmd, stderr=subprocess.PIPE
-    )
 
-    yield
+@pytest.fixture(name="matlab_process", scope="module")
+def matlab_process_fixture(request, tmp_path_factory, matlab_process_setup):
+    """A pytest fixture which creates a fake matlab process with the NLM connection string in request.param.
+
+    The fake matlab process is started once per NLM connection string and shared by all the tests
+    in this module which are parametrized with it, then stopped after the last of them completes.
+
+    Args:
+        request : A built-in pytest fixture. request.param holds the NLM connection string.
+        tmp_path_factory : A built-in pytest fixture used to create a module scoped MATLAB_LOG_DIR.
+        matlab_process_setup (NamedTuple): A NamedTuple which contains values to start the matlab process
+
+    Yields:
+        Path: Path of the matlab_ready_file which the fake matlab server writes its port into.
+    """
+    hostname = socket.gethostname()
+    matlab_log_dir = tmp_path_factory.mktemp("matlab_log_dir")
+
+    if hostname:
+        matlab_log_dir = matlab_log_dir / "hosts" / hostname
+        matlab_log_dir.mkdir(parents=True, exist_ok=True)
+
+    # The fake matlab process reads these environment variables only at startup,
+    # so they are restored as soon as it has been launched.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("MATLAB_LOG_DIR", str(matlab_log_dir))
+        mp.setenv(mwi_env.get_env_name_network_license_manager(), request.param)
+        matlab_process = subprocess.Popen(
+            matlab_process_setup.matlab_cmd, stderr=subprocess.PIPE
+        )
+
+    yield matlab_log_dir / CONNECTOR_SECUREPORT_FILENAME
 
     matlab_process.terminate()
     matlab_process.wait()
 
 
-async def test_matlab_valid_nlm(matlab_ready_file, matlab_process_valid_nlm):
+@pytest.mark.parametrize("matlab_process", [VALID_NLM], indirect=True)
+async def test_matlab_valid_nlm(matlab_process, http_session):
     """Test if the Fake Matlab server has started and is able to serve content.
 
     This test checks if the fake matlab process is able to start a web server and serve some
     fake content.
 
     Args:
-        matlab_process_valid_nlm : A pytest fixture which creates the fake matlab process which starts the web server
+        matlab_process (Path): A pytest fixture which starts the fake matlab web server and yields its matlab_ready_file
+        http_session (aiohttp.ClientSession): A pytest fixture which yields a shared client session
 
     Raises:
         ConnectionError: If the fake matlab server doesn't startup, after the specified number of max_tries this test
         raises a ConnectionError.
     """
 
-    matlab_port = get_matlab_port_from_ready_file(matlab_ready_file)
+    matlab_port = get_matlab_port_from_ready_file(matlab_process)
     if matlab_port is None:
-        raise FileNotFoundError(f"matlab_ready_file at {matlab_ready_file} not found")
-
-    count = 0
-    while True:
-        try:
-            url = f"http://localhost:{matlab_port}/index-jsd-cr.html"
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(url) as resp:
-                    assert resp.content_type == "text/html"
-                    assert resp.status == 200
-                    assert resp.content is not None
-            break
-        except:
-            count += 1
-            if count > FIVE_MAX_TRIES:
-                raise ConnectionError
-            time.sleep(ONE_SECOND_DELAY)
-
-
-@pytest.fixture(name="matlab_process_invalid_nlm")
-def matlab_process_invalid_nlm_fixture(
-    matlab_log_dir, matlab_process_setup, invalid_nlm
-):
-    """A pytest fixture which creates a fake matlab server with an invalid NLM connection string.
-
-    Utilizes matlab_log_dir, matlab_process_setup and invalid_nlm fixtures for creating a
-    fake matlab web server then yields control for tests to utilize it.
-
-
-    Args:
-        matlab_log_dir : A pytest fixture which monkeypatches an environment variable.
-        matlab_process_setup (NamedTuple): A NamedTuple which contains values to start the matlab process
-        invalid_nlm : A pytest fixture which monkeypatches an invalid nlm connection string
-    """
+        raise FileNotFoundError(f"matlab_ready_file at {matlab_process} not found")
 
-    matlab_process = subprocess.Popen(
-        matlab_process_setup.matlab_cmd,
-        stderr=subprocess.PIPE,
+    url = f"http://localhost:{matlab_port}/index-jsd-cr.html"
+    await probe_fake_matlab_server(
+        http_session, url, max_retries=FIVE_MAX_TRIES, delay=ONE_SECOND_DELAY
     )
 
-    yield
-
-    matlab_process.terminate()
-    matlab_process.wait()
-
 
-async def test_matlab_invalid_nlm(matlab_ready_file, matlab_process_invalid_nlm):
+@pytest.mark.parametrize("matlab_process", [INVALID_NLM], indirect=True)
+async def test_matlab_invalid_nlm(matlab_process, http_session):
     """Test which checks if the fake Matlab process stops when NLM string is invalid
 
     When the NLM string is invalid, the fake matlab server will automatically
     exit. This test checks if a ConnectionError is raised when a GET request is sent to it.
 
     Args:
-        matlab_process_invalid_nlm (Process): A process which starts a fake Matlab WebServer.
+        matlab_process (Path): A pytest fixture which starts the fake matlab web server and yields its matlab_ready_file
+        http_session (aiohttp.ClientSession): A pytest fixture which yields a shared client session
     """
-    matlab_port = get_matlab_port_from_ready_file(matlab_ready_file)
-    count = 0
+    matlab_port = get_matlab_port_from_ready_file(matlab_process)
+    url = f"http://localhost:{matlab_port}/index-jsd-cr.html"
 
     with pytest.raises(ConnectionError):
-        while True:
+        await probe_fake_matlab_server(
+            http_session, url, max_retries=TWO_MAX_TRIES, delay=HALF_SECOND_DELAY
+        )
+
+
+async def probe_fake_matlab_server(http_session, url, max_retries, delay):
+    """Checks if the fake matlab server serves content at url.
+
+    One probe is started immediately and each retry is started 'delay' seconds after the previous
+    one, without waiting for earlier probes to finish. Returns as soon as any probe succeeds.
+
+    Args:
+        http_session (aiohttp.ClientSession): Client session used to send the requests
+        url (str): URL to probe
+        max_retries (int): Number of probes to start after the first one
+        delay (float): Seconds between the start of consecutive probes
+
+    Raises:
+        ConnectionError: If none of the probes succeed.
+    """
+
+    async def probe(attempt):
+        await asyncio.sleep(attempt * delay)
+        async with http_session.get(url) as resp:
+            assert resp.content_type == "text/html"
+            assert resp.status == 200
+            assert resp.content is not None
+
+    probes = [asyncio.create_task(probe(attempt)) for attempt in range(max_retries + 1)]
+    try:
+        for completed_probe in asyncio.as_completed(probes):
             try:
-                url = f"http://localhost:{matlab_port}/index-jsd-cr.html"
+                await completed_probe
+                return
+            except Exception:
+                continue
 
-                async with aiohttp.ClientSession(trust_env=True) as session:
-                    async with session.get(url) as resp:
-                        assert resp.content_type == "text/html"
-                        assert resp.status == 200
-                        assert resp.content is not None
+        raise ConnectionError
 
-                break
-            except:
-                count += 1
-                if count > TWO_MAX_TRIES:
-                    raise ConnectionError
-                time.sleep(HALF_SECOND_DELAY)
+    finally:
+        for pending_probe in probes:
+            pending_probe.cancel()
 
 
 def get_matlab_port_from_ready_file(matlab_ready_file):
-    for i in range(FIVE_MAX_TRIES):
+    """Reads the port of the fake matlab server from the matlab_ready_file.
+
+    Retries with an exponentially growing, fully jittered delay so that the port is read soon
+    after the file is written, while the total wait stays bounded by the same deadline as before.
+
+    Args:
+        matlab_ready_file (Path): Path to the matlab_ready_file
+
+    Returns:
+        int | None: The matlab port, or None if it could not be read before the deadline.
+    """
+    deadline = time.monotonic() + FIVE_MAX_TRIES * HALF_SECOND_DELAY
+    max_delay = INITIAL_BACKOFF_DELAY
+
+    while True:
         try:
             with open(matlab_ready_file) as f:
                 return int(f.read())
@@ -242,5 +224,9 @@ def get_matlab_port_from_ready_file(matlab_ready_file):
         # it has been created but the matlab_port information is not yet
         # written into the file which throws ValueError while converting to int.
         except (FileNotFoundError, ValueError):
-            time.sleep(HALF_SECOND_DELAY)
-            continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+
+            time.sleep(min(remaining, random.uniform(0, max_delay)))
+            max_delay *= BACKOFF_FACTOR
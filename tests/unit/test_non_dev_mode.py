@@ -1,8 +1,7 @@
 # Copyright 2020-2022 The MathWorks, Inc.
 
-import os
-import shutil
-from pathlib import Path
+import importlib
+import sys
 
 import matlab_proxy
 import pytest
@@ -17,97 +16,85 @@ test web server's static route table in non-dev mode.
 
 
 @pytest.fixture(name="matlab_port_setup")
-def matlab_port_fixture(monkeypatch):
+def matlab_port_fixture(monkeypatch, free_port):
     """A pytest fixture which monkeypatches an environment variable.
 
     Pytest by default sets MWI_DEV to true.
     Args:
         monkeypatch : A built-in pytest fixture
+        free_port : A pytest fixture which hands out free ports
     """
     # For the test: test_non_dev, when run independently, works as expected.
     # But, when all the tests are run, if port 8000 was picked
     # by some previous test and was not released yet, then test_non_dev will fail to bind to it.
-    # To overcome this, I've temporarily patched MWI_APP_PORT to pick a random port.
-    try:
-        import socket
-
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.bind(("", 0))
-        port = s.getsockname()[1]
-        s.close()
-    except Exception as e:
-        pass
-
+    # To overcome this, MWI_APP_PORT is patched to a free port reserved for this test.
     monkeypatch.setenv(mwi_env.get_env_name_development(), "false")
-    monkeypatch.setenv(mwi_env.get_env_name_app_port(), str(port))
+    monkeypatch.setenv(mwi_env.get_env_name_app_port(), str(free_port()))
 
 
-@pytest.fixture(name="build_frontend")
-def build_frontend_fixture():
-    """A method to build react front-end and place it in matlab_proxy directory
+@pytest.fixture(name="build_frontend", scope="session")
+def build_frontend_fixture(tmp_path_factory):
+    """A method to build react front-end and make it importable as matlab_proxy.gui
 
-    This method builds react front-end and copies the built files to matlab_proxy/gui.
-    Then adds __init__.py to each folder within it to make it accessible for python.
+    This method places placeholder built files into a temporary 'gui' folder and adds __init__.py
+    to each folder within it to make it accessible for python. The temporary folder is then added
+    to the search path of the matlab_proxy package, so the real matlab_proxy directory is left untouched.
     This prework is for the purpose of adding the built files as static assets to the server.
     """
 
-    static_files_dir = os.path.join(os.getcwd(), "matlab_proxy", "gui")
-
-    try:
-        shutil.rmtree(static_files_dir)
-
-    except FileNotFoundError:
-        pass
-
-    finally:
-        # Create static files
-        os.mkdir(static_files_dir)
-        with open(Path(static_files_dir) / "index.html", "w") as f:
-            f.write("<h1> Hello World </h1>")
-
-        with open(Path(static_files_dir) / "manifest.json", "w") as f:
-            f.write('{"display: "standalone"}')
-
-        build_contents = [
-            {
-                "dir": "css",
-                "file": "index.css",
-                "file_content": "html { height: 100%;}",
-            },
-            {
-                "dir": "js",
-                "file": "index.js",
-                "file_content": "import React from 'react';'",
-            },
-            {
-                "dir": "media",
-                "file": "media.txt",
-                "file_content": "Copyright (c) 2020-2022 The Mathworks, Inc.",
-            },
-        ]
-
-        for build_content in build_contents:
-            os.makedirs(Path(static_files_dir) / "static" / build_content["dir"])
-            with open(
-                Path(static_files_dir)
-                / "static"
-                / build_content["dir"]
-                / build_content["file"],
-                "w",
-            ) as f:
-                f.write(build_content["file_content"])
-
-        (Path(static_files_dir) / "__init__.py").touch(exist_ok=True)
-
-        for path, directories, filenames in os.walk(static_files_dir):
-            for directory in directories:
-                (Path(path) / directory / "__init__.py").touch(exist_ok=True)
+    package_dir = tmp_path_factory.mktemp("matlab_proxy")
+    static_files_dir = package_dir / "gui"
+
+    # Create static files
+    static_files_dir.mkdir()
+    (static_files_dir / "index.html").write_text("<h1> Hello World </h1>")
+    (static_files_dir / "manifest.json").write_text('{"display: "standalone"}')
+
+    build_contents = [
+        {
+            "dir": "css",
+            "file": "index.css",
+            "file_content": "html { height: 100%;}",
+        },
+        {
+            "dir": "js",
+            "file": "index.js",
+            "file_content": "import React from 'react';'",
+        },
+        {
+            "dir": "media",
+            "file": "media.txt",
+            "file_content": "Copyright (c) 2020-2022 The Mathworks, Inc.",
+        },
+    ]
+
+    for build_content in build_contents:
+        build_dir = static_files_dir / "static" / build_content["dir"]
+        build_dir.mkdir(parents=True)
+        (build_dir / build_content["file"]).write_text(build_content["file_content"])
+
+    # The directory structure is fixed, so add __init__.py to the known folders
+    # instead of walking the tree.
+    for directory in (
+        static_files_dir,
+        static_files_dir / "static",
+        *(static_files_dir / "static" / c["dir"] for c in build_contents),
+    ):
+        (directory / "__init__.py").touch(exist_ok=True)
+
+    # Prepend the temporary folder so that it takes precedence over a gui folder
+    # which may already have been built into the matlab_proxy package.
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(matlab_proxy, "__path__", [str(package_dir), *matlab_proxy.__path__])
+        importlib.invalidate_caches()
 
         # Yield to execute test
         yield
 
-        # Delete the static files after executing test.
-        shutil.rmtree(static_files_dir)
+    # Forget the temporary gui modules so that later imports do not resolve to them.
+    for module_name in list(sys.modules):
+        if module_name.startswith(f"{matlab_proxy.__name__}.gui"):
+            del sys.modules[module_name]
 
 
 @pytest.fixture(name="mock_settings_get")
@@ -158,7 +145,7 @@ async def test_non_dev(test_server):
     """Tests whether static files are being added to the web server.
 
     This test checks if the test_server successfully added the static files built and
-    copied into matlab_proxy/gui folder are added to the static_route_table of the server.
+    made importable as matlab_proxy.gui are added to the static_route_table of the server.
 
     Args:
         test_server (aiohttp_client): A aiohttp server to send HTTP requests to.
@@ -2,8 +2,8 @@
 
 import os
 import ssl
-import time
 import tempfile
+from functools import lru_cache
 
 import matlab_proxy
 import matlab_proxy.settings as settings
@@ -11,12 +11,21 @@ from matlab_proxy.constants import VERSION_INFO_FILE_NAME, DEFAULT_PROCESS_START
 from pathlib import Path
 import pytest
 from matlab_proxy.util.mwi import environment_variables as mwi_env
-from matlab_proxy.util.mwi.exceptions import MatlabInstallError
+from matlab_proxy.util.mwi.exceptions import FatalError, MatlabInstallError
 
 """This file tests methods defined in settings.py file
 """
 
+# Environment variables which settings.get() expects in non dev mode.
+NON_DEV_MODE_ENV_VARIABLES = {
+    mwi_env.get_env_name_base_url(): "/matlab",
+    mwi_env.get_env_name_app_port(): "8900",
+    mwi_env.get_env_name_app_host(): "localhost",
+    mwi_env.get_env_name_network_license_manager(): "123@nlm",
+}
 
+
+@lru_cache(maxsize=None)
 def version_info_file_content(matlab_version):
     """Returns contents of VersionInfo.xml file for a specific matlab_version
 
@@ -24,7 +33,7 @@ def version_info_file_content(matlab_version):
         matlab_version (str): MATLAB Version
 
     Returns:
-        str: Contents of VersionInfo.xml file for a specific matlab version
+        bytes: Contents of VersionInfo.xml file for a specific matlab version
     """
 
     """
@@ -38,30 +47,29 @@ def version_info_file_content(matlab_version):
                 <date>Nov 03 2020</date>
                 <checksum>2207788044</checksum>
                 </MathWorks_version_info>
-            """
+            """.encode()
 
 
-@pytest.fixture(name="fake_matlab_empty_root_path")
-def fake_matlab_empty_root_path_fixture(tmp_path):
-    empty_matlab_root = tmp_path / "R2020b"
-    os.makedirs(empty_matlab_root, exist_ok=True)
+@pytest.fixture(name="fake_matlab_empty_root_path", scope="session")
+def fake_matlab_empty_root_path_fixture(tmp_path_factory):
+    empty_matlab_root = tmp_path_factory.mktemp("matlab_root") / "R2020b"
+    empty_matlab_root.mkdir()
     return empty_matlab_root
 
 
-@pytest.fixture(name="fake_matlab_executable_path")
+@pytest.fixture(name="fake_matlab_executable_path", scope="session")
 def fake_matlab_executable_path_fixture(fake_matlab_empty_root_path):
     matlab_executable_path = fake_matlab_empty_root_path / "bin" / "matlab"
-    os.makedirs(matlab_executable_path, exist_ok=True)
+    matlab_executable_path.mkdir(parents=True)
 
     return matlab_executable_path
 
 
 def create_file(file_path, file_content):
-    with open(file_path, "w") as f:
-        f.write(file_content)
+    Path(file_path).write_bytes(file_content)
 
 
-@pytest.fixture(name="fake_matlab_valid_version_info_file_path")
+@pytest.fixture(name="fake_matlab_valid_version_info_file_path", scope="session")
 def fake_matlab_valid_version_info_file_path_fixture(fake_matlab_empty_root_path):
     version_info_file_path = fake_matlab_empty_root_path / VERSION_INFO_FILE_NAME
     create_file(version_info_file_path, version_info_file_content("R2020b"))
@@ -69,12 +77,15 @@ def fake_matlab_valid_version_info_file_path_fixture(fake_matlab_empty_root_path
     return version_info_file_path
 
 
-@pytest.fixture(name="fake_matlab_root_path")
+@pytest.fixture(name="fake_matlab_root_path", scope="session")
 def fake_matlab_root_path_fixture(
     fake_matlab_executable_path, fake_matlab_valid_version_info_file_path
 ):
     """Pytest fixture to create a fake matlab installation path.
 
+    The fake matlab installation is created once and shared by all the tests in the session,
+    so tests must not modify it.
+
     Args:
         fake_matlab_executable_path (Pytest fixture): Pytest fixture which returns path to a fake matlab executable
         fake_matlab_valid_version_info_file_path (Pytest fixture): Pytest fixture which returns path of a VersionInfo.xml file for a fake matlab
@@ -86,58 +97,61 @@ def fake_matlab_root_path_fixture(
     return fake_matlab_executable_path.parent.parent
 
 
-@pytest.fixture(name="mock_shutil_which_none")
-def mock_shutil_which_none_fixture(mocker):
-    """Pytest fixture to mock shutil.which() method to return None
+@pytest.fixture(name="mock_shutil_which")
+def mock_shutil_which_fixture(mocker):
+    """Pytest fixture which returns a function to mock shutil.which() method
 
     Args:
         mocker : Built in pytest fixture
-    """
-    mocker.patch("shutil.which", return_value=None)
 
+    Returns:
+        Callable: Mocks shutil.which() to return the value it is called with
+    """
 
-def test_get_matlab_root_path_none(mock_shutil_which_none):
-    """Test to check if settings.get_matlab_path() returns none when no matlab installation is present.
+    def _mock_shutil_which(matlab_executable_path):
+        return mocker.patch.object(
+            settings.shutil, "which", return_value=matlab_executable_path
+        )
 
-    mock_shutil_which_none fixture mocks shutil.which() to return None
+    return _mock_shutil_which
 
-    Args:
-        mock_shutil_which_none : Pytest fixture to mock shutil.which() method to return None.
-    """
-    with pytest.raises(MatlabInstallError) as e:
-        _ = settings.get_matlab_executable_and_root_path()
 
+def test_get_matlab_root_path_none(mock_shutil_which):
+    """Test to check if settings.get_matlab_path() returns none when no matlab installation is present.
 
-@pytest.fixture(name="mock_shutil_which")
-def mock_shutil_which_fixture(mocker, fake_matlab_executable_path):
-    """Pytest fixture to mock shutil.which() method to return a temporary fake matlab path
+    mock_shutil_which fixture mocks shutil.which() to return None
 
     Args:
-        mocker : Built in pytest fixture
-        fake_matlab_executable_path : Pytest fixture which returns path to fake matlab executable file
+        mock_shutil_which : Pytest fixture to mock shutil.which() method.
     """
-    mocker.patch("shutil.which", return_value=fake_matlab_executable_path)
+    mock_shutil_which(None)
+
+    with pytest.raises(MatlabInstallError, match="Unable to find MATLAB"):
+        settings.get_matlab_executable_and_root_path()
 
 
 @pytest.fixture(name="non_existent_path")
 def non_existent_path_fixture(tmp_path):
-    # Build path to a non existent folder
-    random_folder = tmp_path / f'{str(time.time()).replace(".", "")}'
-    non_existent_path = Path(tmp_path) / random_folder
+    # Build path to a non existent folder. tmp_path is unique to each test, so
+    # no random component is required for the folder name.
+    return tmp_path / "non_existent"
 
-    return non_existent_path
 
-
-def test_get_matlab_root_path(fake_matlab_root_path, mock_shutil_which):
+def test_get_matlab_root_path(
+    fake_matlab_root_path, fake_matlab_executable_path, mock_shutil_which
+):
     """Test to check if a valid matlab path is returned
 
 
     mock_shutil_which fixture mocks shutil.which() method to return a temporary path.
 
     Args:
+        fake_matlab_root_path : Pytest fixture which returns a path to fake matlab root
         fake_matlab_executable_path : Pytest fixture which returns a path to fake matlab executable
-        mock_shutil_which : Pytest fixture to mock shutil.which() method to return a fake matlab path
+        mock_shutil_which : Pytest fixture to mock shutil.which() method.
     """
+    mock_shutil_which(fake_matlab_executable_path)
+
     assert settings.get_matlab_executable_and_root_path()[1] == fake_matlab_root_path
 
 
@@ -150,8 +164,10 @@ def test_get_matlab_root_path_invalid_custom_matlab_root(
     )
 
     # Test for appropriate error
-    with pytest.raises(MatlabInstallError) as e:
-        _ = settings.get_matlab_executable_and_root_path()
+    with pytest.raises(
+        MatlabInstallError, match=mwi_env.get_env_name_custom_matlab_root()
+    ):
+        settings.get_matlab_executable_and_root_path()
 
 
 def test_get_matlab_version_none():
@@ -159,7 +175,9 @@ def test_get_matlab_version_none():
     assert settings.get_matlab_version(None) is None
 
 
-def test_get_matlab_version(fake_matlab_root_path, mock_shutil_which):
+def test_get_matlab_version(
+    fake_matlab_root_path, fake_matlab_executable_path, mock_shutil_which
+):
     """Test if a matlab version is returned when from a Version.xml file.
 
     mock_shutil_which fixture will mock the settings.get_matlab_path() to return a fake matlab path
@@ -167,74 +185,95 @@ def test_get_matlab_version(fake_matlab_root_path, mock_shutil_which):
     from this file
 
     Args:
+        fake_matlab_root_path : Pytest fixture which returns a path to fake matlab root
+        fake_matlab_executable_path : Pytest fixture which returns a path to fake matlab executable
         mock_shutil_which : Pytest fixture to mock shutil.which() method.
     """
+    mock_shutil_which(fake_matlab_executable_path)
+
     (
         matlab_executable_path,
         matlab_root_path,
     ) = settings.get_matlab_executable_and_root_path()
-    settings.get_matlab_version(matlab_root_path) is not None
+    assert settings.get_matlab_version(matlab_root_path) == "R2020b"
 
 
-def test_get_matlab_version_invalid_custom_matlab_root(monkeypatch, non_existent_path):
-    # Monkeypatch the env var
-    monkeypatch.setenv(
-        mwi_env.get_env_name_custom_matlab_root(), str(non_existent_path)
-    )
+def test_get_matlab_version_invalid_custom_matlab_root(non_existent_path):
+    """Test to check settings.get_matlab_version() returns None when the matlab root does not exist.
 
-    assert settings.get_matlab_version(None) is None
+    get_matlab_version() does not read MWI_CUSTOM_MATLAB_ROOT, so the invalid root is passed to it directly.
+    """
+    assert settings.get_matlab_version(non_existent_path) is None
 
 
-def test_get_matlab_version_valid_custom_matlab_root(non_existent_path, monkeypatch):
+def test_get_matlab_version_valid_custom_matlab_root(
+    fake_matlab_root_path, monkeypatch
+):
     """Test matlab version when a custom matlab root path is supplied
 
+    The session scoped fake matlab root already contains a valid VersionInfo.xml file,
+    so it is used as the custom matlab root.
+
     Args:
-        tmp_path : Built-in pytest fixture
-        monkeypatch : Built-in pytest fixture        m
+        fake_matlab_root_path : Pytest fixture which returns a path to fake matlab root
+        monkeypatch : Built-in pytest fixture
     """
-    custom_matlab_root_path = non_existent_path
-    os.makedirs(custom_matlab_root_path, exist_ok=True)
     matlab_version = "R2020b"
 
-    # Create a valid VersionInfo.xml file at custom matlab root
-    version_info_file_path = custom_matlab_root_path / VERSION_INFO_FILE_NAME
-    create_file(version_info_file_path, version_info_file_content(matlab_version))
-
     # Monkeypatch the env var
     monkeypatch.setenv(
-        mwi_env.get_env_name_custom_matlab_root(), str(custom_matlab_root_path)
+        mwi_env.get_env_name_custom_matlab_root(), str(fake_matlab_root_path)
     )
 
-    actual_matlab_version = settings.get_matlab_version(custom_matlab_root_path)
+    actual_matlab_version = settings.get_matlab_version(fake_matlab_root_path)
 
     assert actual_matlab_version == matlab_version
 
 
+@pytest.fixture(name="custom_matlab_root", scope="module")
+def custom_matlab_root_fixture(request, tmp_path_factory):
+    """Pytest fixture which creates a custom matlab root for the matlab version in request.param.
+
+    The custom matlab root is an empty folder named after the matlab version. It is created once per
+    matlab version and shared by the tests in this module which are parametrized with that version.
+
+    Args:
+        request : Built-in pytest fixture. request.param holds the matlab version.
+        tmp_path_factory : Built-in pytest fixture
+
+    Returns:
+        pathlib.Path: Path to the custom matlab root
+    """
+    custom_matlab_root_path = (
+        tmp_path_factory.mktemp("custom_matlab_root") / request.param
+    )
+    custom_matlab_root_path.mkdir()
+
+    return custom_matlab_root_path
+
+
 @pytest.mark.parametrize(
-    "matlab_version", ["R2020b", "R2021a"], ids=["R2020b", "R2021a"]
+    "custom_matlab_root, matlab_version",
+    [("R2020b", "R2020b"), ("R2021a", "R2021a")],
+    ids=["R2020b", "R2021a"],
+    indirect=["custom_matlab_root"],
 )
 def test_settings_get_matlab_cmd_for_different_matlab_versions(
-    matlab_version, non_existent_path, monkeypatch
+    custom_matlab_root, matlab_version, monkeypatch, mocker
 ):
     """Test to check settings.get returns the correct matlab_cmd when MWI_CUSTOM_MATLAB_ROOT is set.
 
     Args:
+        custom_matlab_root (Pytest fixture): Pytest fixture which returns a custom matlab root for matlab_version
         matlab_version (str): Matlab version
-        non_existent_path (Pytest fixture): Pytest fixture which returns a temporary non-existent path
         monkeypatch (Builtin pytest fixture): Pytest fixture to monkeypatch environment variables.
+        mocker (Builtin pytest fixture): Pytest fixture to mock settings.get_matlab_version()
     """
-
-    # Create custom matlab root for specific matlab_version
-    custom_matlab_root_path = non_existent_path / matlab_version
-    os.makedirs(custom_matlab_root_path, exist_ok=True)
-
-    # Create a valid VersionInfo.xml file at custom matlab root
-    version_info_file_path = custom_matlab_root_path / VERSION_INFO_FILE_NAME
-    create_file(version_info_file_path, version_info_file_content(matlab_version))
-
     monkeypatch.setenv(
-        mwi_env.get_env_name_custom_matlab_root(), str(custom_matlab_root_path)
+        mwi_env.get_env_name_custom_matlab_root(), str(custom_matlab_root)
     )
+    # Only the path to matlab_cmd is under test, so VersionInfo.xml is not read.
+    mocker.patch.object(settings, "get_matlab_version", return_value=matlab_version)
 
     # Assert matlab_version is in path to matlab_cmd
     sett = settings.get(dev=False)
@@ -257,13 +296,16 @@ def patch_env_variables_fixture(monkeypatch):
     Args:
         monkeypatch : Built-in pytest fixture
     """
-    monkeypatch.setenv(mwi_env.get_env_name_base_url(), "/matlab")
-    monkeypatch.setenv(mwi_env.get_env_name_app_port(), "8900")
-    monkeypatch.setenv(mwi_env.get_env_name_app_host(), "localhost")
-    monkeypatch.setenv(mwi_env.get_env_name_network_license_manager(), "123@nlm")
+    for env_name, env_value in NON_DEV_MODE_ENV_VARIABLES.items():
+        monkeypatch.setenv(env_name, env_value)
 
 
-def test_get_dev_false(patch_env_variables, mock_shutil_which, fake_matlab_root_path):
+def test_get_dev_false(
+    patch_env_variables,
+    mock_shutil_which,
+    fake_matlab_root_path,
+    fake_matlab_executable_path,
+):
     """Test settings.get() method in Non Dev mode.
 
     In Non dev mode, settings.get() expects MWI_APP_PORT, MWI_BASE_URL, APP_HOST AND MLM_LICENSE_FILE env variables
@@ -271,26 +313,53 @@ def test_get_dev_false(patch_env_variables, mock_shutil_which, fake_matlab_root_
 
     Args:
         patch_env_variables : Pytest fixture which monkeypatches some env variables.
+        mock_shutil_which : Pytest fixture to mock shutil.which() method.
+        fake_matlab_root_path : Pytest fixture which returns a path to fake matlab root
+        fake_matlab_executable_path : Pytest fixture which returns a path to fake matlab executable
     """
+    mock_shutil_which(fake_matlab_executable_path)
+
     _settings = settings.get(dev=False)
     assert "matlab" in str(_settings["matlab_cmd"][0])
     assert os.path.isdir(_settings["matlab_path"])
     assert _settings["matlab_protocol"] == "https"
 
 
-def test_get_mw_context_tags(monkeypatch):
+@pytest.fixture(name="default_extension_name", scope="module")
+def default_extension_name_fixture():
+    """Pytest fixture which returns the name of the default matlab-proxy configuration.
+
+    Returns:
+        str: Name of the default configuration
+    """
+    return matlab_proxy.get_default_config_name()
+
+
+@pytest.fixture(name="default_extension_ddux_value", scope="module")
+def default_extension_ddux_value_fixture(default_extension_name):
+    """Pytest fixture which returns the DDUX value of the default matlab-proxy configuration.
+
+    Args:
+        default_extension_name (str): Pytest fixture which returns the name of the default configuration
+
+    Returns:
+        str: DDUX value of the default configuration
+    """
+    return matlab_proxy.get_mwi_ddux_value(default_extension_name)
+
+
+def test_get_mw_context_tags(
+    monkeypatch, default_extension_name, default_extension_ddux_value
+):
     """Tests get_mw_context_tags() function to return appropriate MW_CONTEXT_TAGS"""
 
     # Monkeypatch env var MW_CONTEXT_TAGS to check for if condition
     dockerhub_mw_context_tags = "MATLAB:DOCKERHUB:V1"
     monkeypatch.setenv("MW_CONTEXT_TAGS", dockerhub_mw_context_tags)
 
-    extension_name = matlab_proxy.get_default_config_name()
-
-    matlab_proxy_base_context_tags = matlab_proxy.get_mwi_ddux_value(extension_name)
-    expected_result = f"{dockerhub_mw_context_tags},{matlab_proxy_base_context_tags}"
+    expected_result = f"{dockerhub_mw_context_tags},{default_extension_ddux_value}"
 
-    actual_result = settings.get_mw_context_tags(extension_name)
+    actual_result = settings.get_mw_context_tags(default_extension_name)
 
     assert expected_result == actual_result
 
@@ -376,88 +445,115 @@ def test_get_mwi_config_folder(mocker, hostname, home, expected_mwi_config_dir):
     assert expected_mwi_config_dir == actual_config_dir
 
 
-def test_get_ssl_context_with_SSL_disabled(monkeypatch, tmpdir):
-    monkeypatch.setenv(mwi_env.get_env_name_enable_ssl(), "False")
-    mwi_certs_dir = Path(tmpdir)
-    ssl_context = settings._validate_ssl_files_and_get_ssl_context(mwi_certs_dir)
-    assert ssl_context is None
+@pytest.fixture(name="mock_ssl_context")
+def mock_ssl_context_fixture(mocker):
+    """Pytest fixture to mock ssl.create_default_context() method to return a mock SSL context
 
+    Args:
+        mocker : Built in pytest fixture
 
-def test_get_ssl_context_with_SSL_enabled_auto_generated_certs(
-    monkeypatch, mocker, tmpdir
-):
-    monkeypatch.setenv(mwi_env.get_env_name_enable_ssl(), "True")
-    mocker.patch(
-        "matlab_proxy.settings.generate_new_self_signed_certs",
-        return_value=("cert_path", "key_path"),
-    )
-    mock_ssl_context = mocker.patch("ssl.create_default_context")
-    mock_context = mocker.Mock()
-    mock_ssl_context.return_value = mock_context
-    mock_context.load_cert_chain.side_effect = None
-    mwi_certs_dir = Path(tmpdir)
+    Returns:
+        MagicMock: The SSL context returned by the mocked ssl.create_default_context()
+    """
+    mock_context = mocker.MagicMock(spec=ssl.SSLContext)
+    mocker.patch("ssl.create_default_context", return_value=mock_context)
 
-    ssl_context = settings._validate_ssl_files_and_get_ssl_context(mwi_certs_dir)
-    assert ssl_context is not None
+    return mock_context
 
 
-def test_get_ssl_context_with_invalid_self_signed_certs_returns_none(mocker, tmpdir):
-    mocker.patch(
+@pytest.mark.parametrize(
+    "enable_ssl, custom_ssl_files, load_cert_chain_error, is_ssl_context_expected, expected_error",
+    [
+        pytest.param("False", None, None, False, None, id="SSL disabled"),
+        pytest.param(
+            "True",
+            None,
+            None,
+            True,
+            None,
+            id="SSL enabled with auto generated certs",
+        ),
+        pytest.param(
+            "True",
+            None,
+            Exception("Invalid certificate!"),
+            False,
+            None,
+            id="Invalid self signed certs returns None",
+        ),
+        pytest.param(
+            "True",
+            ("test/cert.pem", "test/key.pem"),
+            None,
+            True,
+            None,
+            id="Valid custom SSL files",
+        ),
+        pytest.param(
+            "True",
+            ("test/cert.pem", "test/key.pem"),
+            Exception("Invalid certificate!"),
+            False,
+            FatalError,
+            id="Invalid custom SSL files raises exception",
+        ),
+    ],
+)
+def test_get_ssl_context(
+    monkeypatch,
+    mocker,
+    tmp_path,
+    mock_ssl_context,
+    enable_ssl,
+    custom_ssl_files,
+    load_cert_chain_error,
+    is_ssl_context_expected,
+    expected_error,
+):
+    """Parameterized test to check the SSL context returned for different SSL configurations.
+
+    Args:
+        monkeypatch : Built-in pytest fixture
+        mocker : Built-in pytest fixture
+        tmp_path : Built-in pytest fixture
+        mock_ssl_context (Mock): Pytest fixture which returns the mocked SSL context
+        enable_ssl (str): Value of the MWI_ENABLE_SSL env variable
+        custom_ssl_files (tuple | None): Custom SSL cert and key files, None to auto generate them
+        load_cert_chain_error (Exception | None): Error raised while loading the certificate chain
+        is_ssl_context_expected (bool): Whether an SSL context is expected to be returned
+        expected_error (type | None): Type of the exception expected to be raised
+    """
+    # Arrange
+    monkeypatch.setenv(mwi_env.get_env_name_enable_ssl(), enable_ssl)
+    if custom_ssl_files:
+        monkeypatch.setenv(mwi_env.get_env_name_ssl_cert_file(), custom_ssl_files[0])
+        monkeypatch.setenv(mwi_env.get_env_name_ssl_key_file(), custom_ssl_files[1])
+        mocker.patch(
+            "matlab_proxy.settings.mwi.validators.validate_ssl_key_and_cert_file",
+            return_value=custom_ssl_files,
+        )
+    new_cert_fx = mocker.patch(
         "matlab_proxy.settings.generate_new_self_signed_certs",
         return_value=("cert_path", "key_path"),
     )
-    mock_ssl_context = mocker.patch("ssl.create_default_context")
-    mock_context = mocker.Mock()
-    mock_ssl_context.return_value = mock_context
-    exception_msg = "Invalid certificate!"
-    mock_context.load_cert_chain.side_effect = Exception(exception_msg)
-    mwi_certs_dir = Path(tmpdir)
-
-    assert settings._validate_ssl_files_and_get_ssl_context(mwi_certs_dir) is None
-
-
-def test_get_ssl_context_with_valid_custom_ssl_files(monkeypatch, mocker, tmpdir):
-    # Sets up the SUT
-    monkeypatch.setenv(mwi_env.get_env_name_enable_ssl(), "True")
-    monkeypatch.setenv(mwi_env.get_env_name_ssl_cert_file(), "test/cert.pem")
-    monkeypatch.setenv(mwi_env.get_env_name_ssl_key_file(), "test/key.pem")
-    mocker.patch(
-        "matlab_proxy.settings.mwi.validators.validate_ssl_key_and_cert_file",
-        return_value=("test/cert.pem", "test/key.pem"),
-    )
-    new_cert_fx = mocker.patch("matlab_proxy.settings.generate_new_self_signed_certs")
-    mock_ssl_context = mocker.patch("ssl.create_default_context")
-    mock_context = mocker.Mock()
-    mock_ssl_context.return_value = mock_context
-    mock_context.load_cert_chain.side_effect = None
-    mwi_certs_dir = Path(tmpdir)
-
-    ssl_context = settings._validate_ssl_files_and_get_ssl_context(mwi_certs_dir)
-    # Checks that self-signed certificate generation is not happening when user supplies valid ssl files
-    new_cert_fx.assert_not_called()
-    assert ssl_context is not None
+    mock_ssl_context.load_cert_chain.side_effect = load_cert_chain_error
 
+    # Act & Assert
+    if expected_error:
+        with pytest.raises(expected_error, match=str(load_cert_chain_error)):
+            settings._validate_ssl_files_and_get_ssl_context(tmp_path)
+        return
 
-def test_get_ssl_context_with_invalid_custom_ssl_files_raises_exception(
-    monkeypatch, mocker, tmpdir
-):
-    # Sets up the SUT
-    monkeypatch.setenv(mwi_env.get_env_name_enable_ssl(), "True")
-    monkeypatch.setenv(mwi_env.get_env_name_ssl_cert_file(), "test/cert.pem")
-    monkeypatch.setenv(mwi_env.get_env_name_ssl_key_file(), "test/key.pem")
-    mocker.patch(
-        "matlab_proxy.settings.mwi.validators.validate_ssl_key_and_cert_file",
-        return_value=("test/cert.pem", "test/key.pem"),
-    )
-    mock_ssl_context = mocker.patch("ssl.create_default_context")
-    mock_context = mocker.Mock()
-    mock_ssl_context.return_value = mock_context
-    exception_msg = "Invalid certificate!"
-    mock_context.load_cert_chain.side_effect = Exception(exception_msg)
-    mwi_certs_dir = Path(tmpdir)
+    ssl_context = settings._validate_ssl_files_and_get_ssl_context(tmp_path)
+
+    if is_ssl_context_expected:
+        assert ssl_context is mock_ssl_context
+    else:
+        assert ssl_context is None
 
-    with pytest.raises(Exception, match=exception_msg):
-        settings._validate_ssl_files_and_get_ssl_context(mwi_certs_dir)
+    # Checks that self-signed certificate generation is not happening when user supplies valid ssl files
+    if custom_ssl_files:
+        new_cert_fx.assert_not_called()
 
 
 @pytest.mark.parametrize(
@@ -474,8 +570,9 @@ def test_get_matlab_settings_custom_code(
 ):
     # Arrange
     monkeypatch.setenv(mwi_env.get_env_name_custom_matlab_code(), custom_code)
-    mocker.patch(
-        "matlab_proxy.settings.get_matlab_executable_and_root_path",
+    mocker.patch.object(
+        settings,
+        "get_matlab_executable_and_root_path",
         return_value=("matlab", None),
     )
 
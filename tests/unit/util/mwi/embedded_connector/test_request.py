@@ -5,60 +5,71 @@ from matlab_proxy.util import mwi
 from matlab_proxy.util.mwi.exceptions import EmbeddedConnectorError
 from tests.unit.util import MockResponse
 
+JSON_DATA = {"hello": "world"}
+
+
+@pytest.fixture(name="mock_request")
+def mock_request_fixture(mocker):
+    """Pytest fixture which returns a function to mock aiohttp.ClientSession.request
 
-async def test_send_request_success(mocker):
-    """Test to check the happy path for send_request
     Args:
         mocker : Built in pytest fixture
+
+    Returns:
+        Callable: Mocks aiohttp.ClientSession.request to return a MockResponse with the supplied 'ok' status
+    """
+
+    def _mock_request(ok, payload=JSON_DATA):
+        return mocker.patch(
+            "aiohttp.ClientSession.request",
+            return_value=MockResponse(payload=payload, ok=ok),
+        )
+
+    return _mock_request
+
+
+async def test_send_request_success(mock_request):
+    """Test to check the happy path for send_request
+    Args:
+        mock_request : Pytest fixture to mock aiohttp.ClientSession.request
     """
     # Arrange
-    json_data = {"hello": "world"}
-    payload = json_data
-    mock_resp = MockResponse(payload=payload, ok=True)
-    _ = mocker.patch("aiohttp.ClientSession.request", return_value=mock_resp)
+    mock_request(ok=True)
 
     # Act
     res = await mwi.embedded_connector.send_request(
-        url="https://localhost:3000", data=json_data, method="GET"
+        url="https://localhost:3000", data=JSON_DATA, method="GET"
     )
 
     # Assert
-    assert json_data["hello"] == res["hello"]
+    assert JSON_DATA["hello"] == res["hello"]
 
 
-async def test_send_request_failure(mocker):
+@pytest.mark.parametrize(
+    "missing_option",
+    [None, "url", "method"],
+    ids=["EC does not respond", "url is not supplied", "method is not supplied"],
+)
+async def test_send_request_failure(mock_request, missing_option):
     """Test to check if send_request fails when
     1) EC does not respond
     2) url or method is not supplied
     Args:
-        mocker : Built in pytest fixture
+        mock_request : Pytest fixture to mock aiohttp.ClientSession.request
+        missing_option (str): Option of send_request which is not supplied
     """
 
     # Arrange
-    json_data = {"hello": "world"}
-
-    payload = json_data
-    mock_resp = MockResponse(payload=payload, ok=False)
-    _ = mocker.patch("aiohttp.ClientSession.request", return_value=mock_resp)
+    mock_request(ok=False)
 
-    # Doesnt have url or data or method
-    mock_resp = MockResponse(payload=payload, ok=False)
+    options = {
+        "url": "https://localhost:3000",
+        "data": JSON_DATA,
+        "method": "GET",
+    }
+    if missing_option:
+        options[missing_option] = ""
 
-    # Act
-
-    # Failed to communicate with EmbeddedConnector
+    # Act & Assert
     with pytest.raises(EmbeddedConnectorError):
-        _ = await mwi.embedded_connector.send_request(
-            url="https://localhost:3000", method="GET", data=json_data
-        )
-
-    for key in ["url", "method"]:
-        options = {
-            "url": "https://localhost:3000",
-            "data": json_data,
-            "method": "GET",
-        }
-        options[key] = ""
-        # Assert
-        with pytest.raises(EmbeddedConnectorError):
-            _ = await mwi.embedded_connector.send_request(**options)
+        _ = await mwi.embedded_connector.send_request(**options)
@@ -1,6 +1,9 @@
 # Copyright 2024 The MathWorks, Inc.
+from types import SimpleNamespace
+
 import pytest
 
+from matlab_proxy.util import system
 from matlab_proxy.util.mwi.download import (
     _get_download_payload_path,
     get_download_url,
@@ -8,22 +11,24 @@ from matlab_proxy.util.mwi.download import (
 )
 
 
-# Mock the request object
-@pytest.fixture
-def mock_request_fixture(mocker):
-    mock_req = mocker.MagicMock()
-    mock_req.app = {
-        "settings": {"base_url": ""},
-        "state": mocker.MagicMock(),
-    }
-    mock_req.rel_url = mocker.MagicMock()
-    return mock_req
-
+# Mock the request object. It is shared by the tests in this module,
+# each of which sets the base url and path it needs before using it.
+@pytest.fixture(scope="module")
+def mock_request_fixture():
+    return SimpleNamespace(
+        app={
+            "settings": {"base_url": ""},
+            "state": SimpleNamespace(settings={}, _get_token_auth_headers=lambda: {}),
+        },
+        rel_url=SimpleNamespace(path=""),
+    )
 
-def _get_expected_output_based_on_os_type(paths: list) -> str:
-    import matlab_proxy.util.system as system
 
-    return "\\".join(paths) if system.is_windows() else "/".join(paths)
+# Expected payload path for the posix style download requests. The separator depends
+# on the OS running the tests, so it is computed once here before any test patches is_windows().
+EXPECTED_POSIX_PAYLOAD_PATH = ("\\" if system.is_windows() else "/").join(
+    ["/some", "path", "to", "file.txt"]
+)
 
 
 # Test for is_download_request function
@@ -50,7 +55,7 @@ def test_is_download_request(mock_request_fixture, test_base_url, path, expected
 
 # Test for _get_download_payload_path function
 # This test is a bit tricky since it involves file system operations and OS checks.
-# We will mock system.is_windows() and test for both Windows and Posix systems.
+# We will monkeypatch system.is_windows() and test for both Windows and Posix systems.
 @pytest.mark.parametrize(
     "is_windows, test_base_url, path, expected",
     [
@@ -70,13 +75,13 @@ def test_is_download_request(mock_request_fixture, test_base_url, path, expected
             False,
             "",
             "/download/some/path/to/file.txt",
-            _get_expected_output_based_on_os_type(["/some", "path", "to", "file.txt"]),
+            EXPECTED_POSIX_PAYLOAD_PATH,
         ),
         (
             False,
             "/base",
             "/base/download/some/path/to/file.txt",
-            _get_expected_output_based_on_os_type(["/some", "path", "to", "file.txt"]),
+            EXPECTED_POSIX_PAYLOAD_PATH,
         ),
     ],
     ids=[
@@ -87,9 +92,9 @@ def test_is_download_request(mock_request_fixture, test_base_url, path, expected
     ],
 )
 def test_get_download_payload_path(
-    mock_request_fixture, mocker, is_windows, test_base_url, path, expected
+    mock_request_fixture, monkeypatch, is_windows, test_base_url, path, expected
 ):
-    mocker.patch("matlab_proxy.util.system.is_windows", return_value=is_windows)
+    monkeypatch.setattr("matlab_proxy.util.system.is_windows", lambda: is_windows)
     mock_request_fixture.app["settings"]["base_url"] = test_base_url
     mock_request_fixture.rel_url.path = path
     assert _get_download_payload_path(mock_request_fixture) == expected
@@ -123,7 +128,7 @@ def test_get_download_payload_path_invalid_request(mock_request_fixture):
     ids=["connector returning correct download url", "connector returning an error"],
 )
 async def test_get_download_url(
-    mock_request_fixture, mocker, response_json, expected_url
+    mock_request_fixture, monkeypatch, response_json, expected_url
 ):
     test_base_url = "/"
     path = "/download/some/path/to/file.txt"
@@ -134,17 +139,19 @@ async def test_get_download_url(
     mock_request_fixture.app["settings"]["base_url"] = test_base_url
     mock_request_fixture.rel_url.path = path
 
-    mocker.patch(
+    async def send_request(*args, **kwargs):
+        return response_json
+
+    monkeypatch.setattr(
         "matlab_proxy.util.mwi.embedded_connector.helpers.get_data_to_feval_mcode",
-        return_value={},
+        lambda *args, **kwargs: {},
     )
-    mocker.patch(
+    monkeypatch.setattr(
         "matlab_proxy.util.mwi.embedded_connector.helpers.get_mvm_endpoint",
-        return_value="http://mwi-server.com",
+        lambda *args, **kwargs: "http://mwi-server.com",
     )
-    mocker.patch(
-        "matlab_proxy.util.mwi.embedded_connector.send_request",
-        return_value=response_json,
+    monkeypatch.setattr(
+        "matlab_proxy.util.mwi.embedded_connector.send_request", send_request
     )
 
     download_url = await get_download_url(mock_request_fixture)
@@ -7,6 +7,8 @@ import os
 import pytest
 from matlab_proxy.util.mwi import logger as mwi_logger
 
+LOG_LEVEL_ENV_NAME, LOG_FILE_ENV_NAME = mwi_logger.get_environment_variable_names()
+
 
 def test_get():
     """This test checks if the get method returns a logger with expected name"""
@@ -24,9 +26,8 @@ def test_get_mw_logger_name():
 def test_get_with_no_environment_variables(monkeypatch):
     """This test checks if the get method returns a logger with default settings if no environment variable is set"""
     # Delete the environment variables if they do exist
-    env_names_list = mwi_logger.get_environment_variable_names()
-    monkeypatch.delenv(env_names_list[0], raising=False)
-    monkeypatch.delenv(env_names_list[1], raising=False)
+    monkeypatch.delenv(LOG_LEVEL_ENV_NAME, raising=False)
+    monkeypatch.delenv(LOG_FILE_ENV_NAME, raising=False)
 
     logger = mwi_logger.get(init=True)
     assert logger.isEnabledFor(logging.INFO) == True
@@ -35,9 +36,8 @@ def test_get_with_no_environment_variables(monkeypatch):
 
 def test_get_with_environment_variables(monkeypatch, tmp_path):
     """This test checks if the get method returns a logger with the specified settings"""
-    env_names_list = mwi_logger.get_environment_variable_names()
-    monkeypatch.setenv(env_names_list[0], "CRITICAL")
-    monkeypatch.setenv(env_names_list[1], str(tmp_path / "testing123.log"))
+    monkeypatch.setenv(LOG_LEVEL_ENV_NAME, "CRITICAL")
+    monkeypatch.setenv(LOG_FILE_ENV_NAME, str(tmp_path / "testing123.log"))
 
     logger = mwi_logger.get(init=True)
 
@@ -64,8 +64,7 @@ def test_set_logging_configuration_known_logging_levels(
     monkeypatch, log_level, expected_level
 ):
     """This test checks if the logger is set with correct level for known log levels"""
-    env_names_list = mwi_logger.get_environment_variable_names()
-    monkeypatch.setenv(env_names_list[0], log_level)
+    monkeypatch.setenv(LOG_LEVEL_ENV_NAME, log_level)
     logger = mwi_logger.get(init=True)
     assert (
         logger.isEnabledFor(expected_level) == True
@@ -75,8 +74,7 @@ def test_set_logging_configuration_known_logging_levels(
 @pytest.mark.parametrize("log_level", ["ABC", "abc"])
 def test_set_logging_configuration_unknown_logging_levels(monkeypatch, log_level):
     """This test checks if the logger is set with INFO level for unknown log levels"""
-    env_names_list = mwi_logger.get_environment_variable_names()
-    monkeypatch.setenv(env_names_list[0], log_level)
+    monkeypatch.setenv(LOG_LEVEL_ENV_NAME, log_level)
     logger = mwi_logger.get(init=True)
     assert (
         logger.isEnabledFor(logging.INFO) == True
@@ -1,5 +1,7 @@
 # Copyright 2023-2024 The MathWorks, Inc.
 
+import asyncio
+
 import pytest
 from aiohttp import web
 from aiohttp_session import setup as aiohttp_session_setup
@@ -10,6 +12,8 @@ from matlab_proxy.constants import MWI_AUTH_TOKEN_NAME_FOR_HTTP
 from matlab_proxy.util.mwi import environment_variables as mwi_env
 from matlab_proxy.util.mwi import token_auth
 
+MWI_AUTH_TOKEN_NAME_FOR_ENV = mwi_env.get_env_name_mwi_auth_token().lower()
+
 ## APIs to test:
 # 1. generate_mwi_auth_token (auth enabled, auth enabled+custom token, custom token, auth disabled)
 # 2. authenticate_access_decorator (headers & url_string, and session storage)
@@ -46,9 +50,9 @@ def test_generate_mwi_auth_token(
     monkeypatch, expected_auth_enablement, auth_token, expected_auth_token
 ):
     monkeypatch.setenv(
-        mwi_env.get_env_name_enable_mwi_auth_token(), str(expected_auth_enablement)
+        mwi_env.get_env_name_enable_mwi_auth_token(), expected_auth_enablement
     )
-    monkeypatch.setenv(mwi_env.get_env_name_mwi_auth_token(), str(auth_token))
+    monkeypatch.setenv(mwi_env.get_env_name_mwi_auth_token(), auth_token)
 
     generated_token = token_auth.generate_mwi_auth_token_and_hash()["token"]
     assert generated_token == expected_auth_token
@@ -58,7 +62,7 @@ def test_auto_token_generation_with_enable_flag_set(monkeypatch):
     # Test if token is auto-generated when MWI_ENABLE_AUTH_TOKEN is True
     expected_auth_enablement = "True"
     monkeypatch.setenv(
-        mwi_env.get_env_name_enable_mwi_auth_token(), str(expected_auth_enablement)
+        mwi_env.get_env_name_enable_mwi_auth_token(), expected_auth_enablement
     )
 
     generated_token = token_auth.generate_mwi_auth_token_and_hash()["token"]
@@ -80,6 +84,19 @@ def get_custom_auth_token_str():
     return "CustomTokenStr123_-TestOtherAPIS"
 
 
+@pytest.fixture
+def get_custom_auth_token_hash(get_custom_auth_token_str):
+    return token_auth._generate_hash(get_custom_auth_token_str)
+
+
+@pytest.fixture(scope="module")
+def fernet_instance():
+    """Fernet instance used to encrypt the session cookies of the fake servers.
+    Generating the key once is enough, as each fake server gets its own session storage.
+    """
+    return fernet.Fernet(fernet.Fernet.generate_key())
+
+
 @token_auth.authenticate_access_decorator
 async def fake_endpoint(request):
     if request.method == "POST":
@@ -89,20 +106,16 @@ async def fake_endpoint(request):
 
 
 @pytest.fixture
-def fake_server_with_auth_enabled(
-    loop, aiohttp_client, monkeypatch, get_custom_auth_token_str
+async def fake_server_with_auth_enabled(
+    aiohttp_client,
+    get_custom_auth_token_str,
+    get_custom_auth_token_hash,
+    fernet_instance,
 ):
-    auth_token = get_custom_auth_token_str
-    auth_enablement = "True"
-    monkeypatch.setenv(
-        mwi_env.get_env_name_enable_mwi_auth_token(), str(auth_enablement)
-    )
-    monkeypatch.setenv(mwi_env.get_env_name_mwi_auth_token(), str(auth_token))
-
-    (
-        mwi_auth_token,
-        mwi_auth_token_hash,
-    ) = token_auth.generate_mwi_auth_token_and_hash().values()
+    # Token generation from the environment is covered by the tests above,
+    # so the settings are built directly from the custom token.
+    mwi_auth_token = get_custom_auth_token_str
+    mwi_auth_token_hash = get_custom_auth_token_hash
 
     app = web.Application()
     app["settings"] = {
@@ -110,60 +123,34 @@ def fake_server_with_auth_enabled(
         "mwi_auth_token": mwi_auth_token,
         "mwi_auth_token_hash": mwi_auth_token_hash,
         "mwi_auth_token_name_for_http": MWI_AUTH_TOKEN_NAME_FOR_HTTP,
-        "mwi_auth_token_name_for_env": mwi_env.get_env_name_mwi_auth_token().lower(),
+        "mwi_auth_token_name_for_env": MWI_AUTH_TOKEN_NAME_FOR_ENV,
     }
     app.router.add_get("/", fake_endpoint)
     app.router.add_post("/", fake_endpoint)
     # Setup the session storage
-    fernet_key = fernet.Fernet.generate_key()
-    f = fernet.Fernet(fernet_key)
     aiohttp_session_setup(
-        app, EncryptedCookieStorage(f, cookie_name="matlab-proxy-session")
+        app,
+        EncryptedCookieStorage(fernet_instance, cookie_name="matlab-proxy-session"),
     )
-    return loop.run_until_complete(aiohttp_client(app))
+    return await aiohttp_client(app)
 
 
+@pytest.mark.parametrize(
+    "use_token_hash",
+    [False, True],
+    ids=["token in headers", "token hash in headers"],
+)
 async def test_set_value_with_token(
-    fake_server_with_auth_enabled, get_custom_auth_token_str
+    fake_server_with_auth_enabled,
+    get_custom_auth_token_str,
+    get_custom_auth_token_hash,
+    use_token_hash,
 ):
+    token = get_custom_auth_token_hash if use_token_hash else get_custom_auth_token_str
     resp = await fake_server_with_auth_enabled.post(
         "/",
         data={"value": "foo"},
-        headers={MWI_AUTH_TOKEN_NAME_FOR_HTTP: get_custom_auth_token_str},
-    )
-    assert resp.status == web.HTTPOk.status_code
-    assert await resp.text() == "thanks for the data"
-    assert fake_server_with_auth_enabled.server.app["value"] == "foo"
-
-    # Test subsequent requests do not need token authentication
-    resp2 = await fake_server_with_auth_enabled.post(
-        "/",
-        data={"value": "foobar"},
-    )
-    assert resp2.status == web.HTTPOk.status_code
-    assert fake_server_with_auth_enabled.server.app["value"] == "foobar"
-
-    # Test request which accepts cookies from previous request
-    resp3 = await fake_server_with_auth_enabled.post(
-        "/",
-        data={"value": "foobar1"},
-        cookies=resp.cookies,
-    )
-    assert resp3.status == web.HTTPOk.status_code
-    assert fake_server_with_auth_enabled.server.app["value"] == "foobar1"
-
-
-async def test_set_value_with_token_hash(
-    fake_server_with_auth_enabled, get_custom_auth_token_str
-):
-    resp = await fake_server_with_auth_enabled.post(
-        "/",
-        data={"value": "foo"},
-        headers={
-            MWI_AUTH_TOKEN_NAME_FOR_HTTP: token_auth._generate_hash(
-                get_custom_auth_token_str
-            )
-        },
+        headers={MWI_AUTH_TOKEN_NAME_FOR_HTTP: token},
     )
     assert resp.status == web.HTTPOk.status_code
     assert await resp.text() == "thanks for the data"
@@ -204,18 +191,44 @@ async def test_set_value_with_invalid_token(fake_server_with_auth_enabled):
     assert resp2.status == web.HTTPForbidden.status_code
 
 
+async def test_get_value_with_non_ascii_token_in_query_params(
+    fake_server_with_auth_enabled,
+):
+    fake_server_with_auth_enabled.server.app["value"] = "bar"
+    resp = await fake_server_with_auth_enabled.get(
+        "/", params={MWI_AUTH_TOKEN_NAME_FOR_HTTP: "invälid-tökén"}
+    )
+    assert resp.status == web.HTTPForbidden.status_code
+
+
+async def test_get_value_with_non_utf8_token_in_headers(fake_server_with_auth_enabled):
+    # aiohttp clients encode header values as UTF-8, so the raw request is written by hand
+    # to send a header value which the server decodes with surrogate escapes.
+    fake_server_with_auth_enabled.server.app["value"] = "bar"
+    reader, writer = await asyncio.open_connection(
+        fake_server_with_auth_enabled.host, fake_server_with_auth_enabled.port
+    )
+    writer.write(
+        f"GET / HTTP/1.1\r\nHost: localhost\r\n{MWI_AUTH_TOKEN_NAME_FOR_HTTP}: ".encode()
+        + b"t\xffk"
+        + b"\r\nConnection: close\r\n\r\n"
+    )
+    await writer.drain()
+    status_line = await reader.readline()
+    writer.close()
+    await writer.wait_closed()
+
+    assert status_line.split()[1] == str(web.HTTPForbidden.status_code).encode()
+
+
 async def test_set_value_with_token_in_params(
-    fake_server_with_auth_enabled, get_custom_auth_token_str
+    fake_server_with_auth_enabled, get_custom_auth_token_hash
 ):
     fake_server_with_auth_enabled.server.app["value"] = "foo"
     resp = await fake_server_with_auth_enabled.post(
         "/",
         data={"value": "foofoo"},
-        params={
-            MWI_AUTH_TOKEN_NAME_FOR_HTTP: token_auth._generate_hash(
-                get_custom_auth_token_str
-            )
-        },
+        params={MWI_AUTH_TOKEN_NAME_FOR_HTTP: get_custom_auth_token_hash},
     )
     assert resp.status == web.HTTPOk.status_code
     assert await resp.text() == "thanks for the data"
@@ -237,16 +250,12 @@ async def test_get_value_without_token(fake_server_with_auth_enabled):
 
 
 async def test_get_value_with_token_in_query_params(
-    fake_server_with_auth_enabled, get_custom_auth_token_str
+    fake_server_with_auth_enabled, get_custom_auth_token_hash
 ):
     fake_server_with_auth_enabled.server.app["value"] = "bar"
     resp = await fake_server_with_auth_enabled.get(
         "/",
-        params={
-            MWI_AUTH_TOKEN_NAME_FOR_HTTP: token_auth._generate_hash(
-                get_custom_auth_token_str
-            )
-        },
+        params={MWI_AUTH_TOKEN_NAME_FOR_HTTP: get_custom_auth_token_hash},
     )
     assert resp.status == web.HTTPOk.status_code
     assert await resp.text() == "value: bar"
@@ -256,32 +265,22 @@ async def test_get_value_with_token_in_query_params(
 
 
 @pytest.fixture
-def fake_server_without_auth_enabled(loop, aiohttp_client, monkeypatch):
-    auth_enablement = "False"
-    monkeypatch.setenv(
-        mwi_env.get_env_name_enable_mwi_auth_token(), str(auth_enablement)
-    )
-    (
-        mwi_auth_token,
-        mwi_auth_token_hash,
-    ) = token_auth.generate_mwi_auth_token_and_hash().values()
-
+async def fake_server_without_auth_enabled(aiohttp_client, fernet_instance):
     app = web.Application()
     app["settings"] = {
-        "mwi_is_token_auth_enabled": mwi_auth_token != None,
-        "mwi_auth_token": mwi_auth_token,
-        "mwi_auth_token_hash": mwi_auth_token_hash,
-        "mwi_auth_token_name_for_env": mwi_env.get_env_name_mwi_auth_token().lower(),
+        "mwi_is_token_auth_enabled": False,
+        "mwi_auth_token": None,
+        "mwi_auth_token_hash": None,
+        "mwi_auth_token_name_for_env": MWI_AUTH_TOKEN_NAME_FOR_ENV,
     }
     app.router.add_get("/", fake_endpoint)
     app.router.add_post("/", fake_endpoint)
     # Setup the session storage
-    fernet_key = fernet.Fernet.generate_key()
-    f = fernet.Fernet(fernet_key)
     aiohttp_session_setup(
-        app, EncryptedCookieStorage(f, cookie_name="matlab-proxy-session")
+        app,
+        EncryptedCookieStorage(fernet_instance, cookie_name="matlab-proxy-session"),
     )
-    return loop.run_until_complete(aiohttp_client(app))
+    return await aiohttp_client(app)
 
 
 async def test_get_value(fake_server_without_auth_enabled):
@@ -5,13 +5,7 @@
 import os
 import random
 import socket
-import tempfile
-from matlab_proxy.util.mwi.validators import (
-    validate_idle_timeout,
-    validate_matlab_root_path,
-)
 from matlab_proxy import constants
-from pathlib import Path
 
 import matlab_proxy
 import pytest
@@ -24,6 +18,10 @@ from matlab_proxy.util.mwi.exceptions import (
     MatlabInstallError,
 )
 
+NLM_ENV_NAME = mwi_env.get_env_name_network_license_manager()
+SSL_CERT_FILE_ENV_NAME = mwi_env.get_env_name_ssl_cert_file()
+SSL_KEY_FILE_ENV_NAME = mwi_env.get_env_name_ssl_key_file()
+
 
 @pytest.mark.parametrize(
     "MLM_LICENSE_FILE",
@@ -43,81 +41,59 @@ from matlab_proxy.util.mwi.exceptions import (
 def test_validate_mlm_license_file_invalid_value(MLM_LICENSE_FILE, monkeypatch):
     """Check if validator raises expected exception"""
 
-    env_name = mwi_env.get_env_name_network_license_manager()
-
-    monkeypatch.setenv(env_name, MLM_LICENSE_FILE)
-    nlm_conn_str = os.getenv(env_name)
+    monkeypatch.setenv(NLM_ENV_NAME, MLM_LICENSE_FILE)
+    nlm_conn_str = os.getenv(NLM_ENV_NAME)
 
     with pytest.raises(NetworkLicensingError) as e_info:
         validators.validate_mlm_license_file(nlm_conn_str)
     assert MLM_LICENSE_FILE in str(e_info.value)
 
 
-@pytest.fixture(name="temporary_license_file")
-def temporary_license_file_fixture(tmp_path):
-    """Pytest fixture which returns a valid path to temporary license file."""
-    import time
+@pytest.fixture(name="temporary_existing_file", scope="session")
+def temporary_existing_file_fixture(tmp_path_factory):
+    """Pytest fixture which returns a valid path to an existing temporary file.
 
-    temp_license_file_path = tmp_path / f'{str(time.time()).replace(".", "")}.lic'
-    temp_license_file_path.touch()
+    The file is created once and shared by all the tests in the session, which only read it.
+    """
+    temp_file_path = tmp_path_factory.mktemp("existing") / "existing_file.txt"
+    temp_file_path.touch()
 
-    return temp_license_file_path
+    return temp_file_path
 
 
 def test_validate_mlm_license_file_valid_license_file_path(
-    temporary_license_file, monkeypatch
+    temporary_existing_file, monkeypatch
 ):
     """Check if a valid license path has been supplied to MLM_LICENSE_FILE env var"""
-    env_name = mwi_env.get_env_name_network_license_manager()
-    monkeypatch.setenv(env_name, str(temporary_license_file))
+    monkeypatch.setenv(NLM_ENV_NAME, str(temporary_existing_file))
+
+    validated_file_path = validators.validate_mlm_license_file(os.getenv(NLM_ENV_NAME))
+    assert str(temporary_existing_file) == validated_file_path
+
 
-    validated_file_path = validators.validate_mlm_license_file(os.getenv(env_name))
-    assert str(temporary_license_file) == validated_file_path
+NLM_SERVER = "1234@1.2_any-alphanumeric"
+NLM_SERVER_TRIAD = ",".join([NLM_SERVER] * 3)
 
 
 @pytest.mark.parametrize(
     "MLM_LICENSE_FILE",
     [
-        (["1234@1.2_any-alphanumeric"]),
-        (["1234@1.2_any-alphanumeric", "1234@1.2_any-alphanumeric"]),
-        (
-            [
-                "1234@1.2_any-alphanumeric",
-                "1234@1.2_any-alphanumeric",
-                "1234@1.2_any-alphanumeric",
-            ]
+        pytest.param([NLM_SERVER], id="1 NLM server"),
+        pytest.param([NLM_SERVER] * 2, id="2 NLM servers"),
+        pytest.param([NLM_SERVER] * 3, id="3 NLM servers"),
+        pytest.param([NLM_SERVER_TRIAD], id="Just a server triad"),
+        pytest.param(
+            [NLM_SERVER, NLM_SERVER_TRIAD],
+            id="1 NLM server prefixed to a server triad",
         ),
-        [
-            "1234@1.2_any-alphanumeric,1234@1.2_any-alphanumeric,1234@1.2_any-alphanumeric"
-        ],
-        (
-            [
-                "1234@1.2_any-alphanumeric",
-                "1234@1.2_any-alphanumeric,1234@1.2_any-alphanumeric,1234@1.2_any-alphanumeric",
-            ]
+        pytest.param(
+            [NLM_SERVER_TRIAD, NLM_SERVER],
+            id="1 NLM server suffixed to a server triad",
         ),
-        (
-            [
-                "1234@1.2_any-alphanumeric,1234@1.2_any-alphanumeric,1234@1.2_any-alphanumeric",
-                "1234@1.2_any-alphanumeric",
-            ]
+        pytest.param(
+            [NLM_SERVER, NLM_SERVER_TRIAD, NLM_SERVER],
+            id="1 NLM server prefixed and another suffixed to a server triad",
         ),
-        (
-            [
-                "1234@1.2_any-alphanumeric",
-                "1234@1.2_any-alphanumeric,1234@1.2_any-alphanumeric,1234@1.2_any-alphanumeric",
-                "1234@1.2_any-alphanumeric",
-            ]
-        ),
-    ],
-    ids=[
-        "1 NLM server",
-        "2 NLM servers",
-        "3 NLM servers",
-        "Just a server triad",
-        "1 NLM server prefixed to a server triad",
-        "1 NLM server suffixed to a server triad",
-        "1 NLM server prefixed and another suffixed to a server triad",
     ],
 )
 def test_validate_mlm_license_file_for_valid_nlm_string(MLM_LICENSE_FILE, monkeypatch):
@@ -125,9 +101,8 @@ def test_validate_mlm_license_file_for_valid_nlm_string(MLM_LICENSE_FILE, monkey
 
     seperator = system.get_mlm_license_file_seperator()
     MLM_LICENSE_FILE = seperator.join(MLM_LICENSE_FILE)
-    env_name = mwi_env.get_env_name_network_license_manager()
-    monkeypatch.setenv(env_name, MLM_LICENSE_FILE)
-    conn_str = validators.validate_mlm_license_file(os.getenv(env_name))
+    monkeypatch.setenv(NLM_ENV_NAME, MLM_LICENSE_FILE)
+    conn_str = validators.validate_mlm_license_file(os.getenv(NLM_ENV_NAME))
     assert conn_str == MLM_LICENSE_FILE
 
 
@@ -136,35 +111,27 @@ def test_validate_mlm_license_file_None():
     assert validators.validate_mlm_license_file(None) is None
 
 
-def test_get_with_environment_variables(monkeypatch):
+def test_get_with_environment_variables(monkeypatch, temporary_existing_file):
     """Check if path to license file passes validation"""
-    env_name = mwi_env.get_env_name_network_license_manager()
-    fd, path = tempfile.mkstemp()
-    monkeypatch.setenv(env_name, path)
-    try:
-        conn_str = validators.validate_mlm_license_file(os.getenv(env_name))
-        assert conn_str == str(path)
-    finally:
-        os.close(fd)
-        os.remove(path)
+    path = temporary_existing_file
+    monkeypatch.setenv(NLM_ENV_NAME, str(path))
+
+    conn_str = validators.validate_mlm_license_file(os.getenv(NLM_ENV_NAME))
+    assert conn_str == str(path)
 
 
 def test_validate_app_port_is_free_false():
     """Test to validate if supplied app port is free"""
-    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    s.bind(("", 0))
-    port = s.getsockname()[1]
-    with pytest.raises(FatalError) as e:
-        validators.validate_app_port_is_free(port)
-    s.close()
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("", 0))
+        port = s.getsockname()[1]
+        with pytest.raises(FatalError):
+            validators.validate_app_port_is_free(port)
 
 
-def test_validate_app_port_is_free_true():
+def test_validate_app_port_is_free_true(free_port):
     """Test to validate if supplied app port is free"""
-    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    s.bind(("", 0))
-    port = s.getsockname()[1]
-    s.close()
+    port = free_port()
     assert validators.validate_app_port_is_free(port) == port
 
 
@@ -226,112 +193,84 @@ def test_validate_base_url_no_prefix_error():
         validators.validate_base_url("matlab/")
 
 
-def test_validate_mwi_ssl_key_and_cert_file(monkeypatch):
+def test_validate_mwi_ssl_key_and_cert_file(monkeypatch, temporary_existing_file):
     """Check if port@hostname passes validation"""
-    ssl_cert_file_env_name = mwi_env.get_env_name_ssl_cert_file()
-    ssl_key_file_env_name = mwi_env.get_env_name_ssl_key_file()
-    fd, path = tempfile.mkstemp()
-
-    monkeypatch.setenv(ssl_cert_file_env_name, path)
-    monkeypatch.setenv(ssl_key_file_env_name, path)
-    try:
-        # Verify that if KEY and CERT are provided
-        key_file, cert_file = validators.validate_ssl_key_and_cert_file(
-            os.getenv(ssl_key_file_env_name), os.getenv(ssl_cert_file_env_name)
-        )
-        assert key_file == str(path)
-        assert cert_file == str(path)
+    # The validators only check that the file exists, so any existing file will do.
+    path = temporary_existing_file
 
-        # Verify that KEY can be None
-        key_file, cert_file = validators.validate_ssl_key_and_cert_file(
-            None, os.getenv(ssl_cert_file_env_name)
-        )
-        assert key_file == None
-        assert cert_file == str(path)
-
-        # Verify that if KEY is provided, CERT must also be provided
-        with pytest.raises(FatalError) as e:
-            validators.validate_ssl_key_and_cert_file(
-                os.getenv(ssl_key_file_env_name), None
-            )
-
-        # Verify that KEY is valid file location
-        with pytest.raises(FatalError) as e:
-            validators.validate_ssl_key_and_cert_file(
-                "/file/does/not/exist", os.getenv(ssl_cert_file_env_name)
-            )
-
-        # Verify that KEY is valid file location
-        with pytest.raises(FatalError) as e:
-            validators.validate_ssl_key_and_cert_file(
-                os.getenv(ssl_key_file_env_name), "/file/does/not/exist"
-            )
-    finally:
-        # Need to close the file descriptor in Windows
-        # Or else PermissionError is raised.
-        os.close(fd)
-        os.remove(path)
-
-
-def test_validate_matlab_root_path(tmp_path):
-    """Checks if matlab root is validated without raising exceptions"""
+    for env_name in (SSL_CERT_FILE_ENV_NAME, SSL_KEY_FILE_ENV_NAME):
+        monkeypatch.setenv(env_name, str(path))
 
-    # Arrange
-    matlab_root = Path(tmp_path) / "MATLAB"
-    os.mkdir(matlab_root)
-    version_info_file = Path(matlab_root) / constants.VERSION_INFO_FILE_NAME
-    version_info_file.touch()
-
-    # Act
-    actual_matlab_root = validate_matlab_root_path(
-        matlab_root, is_custom_matlab_root=False
+    # Verify that if KEY and CERT are provided
+    key_file, cert_file = validators.validate_ssl_key_and_cert_file(
+        os.getenv(SSL_KEY_FILE_ENV_NAME), os.getenv(SSL_CERT_FILE_ENV_NAME)
     )
-    actual_matlab_root_custom = validate_matlab_root_path(
-        matlab_root, is_custom_matlab_root=True
-    )
-
-    # Assert
-    assert actual_matlab_root == matlab_root
-    assert actual_matlab_root_custom == matlab_root
+    assert key_file == str(path)
+    assert cert_file == str(path)
 
+    # Verify that KEY can be None
+    key_file, cert_file = validators.validate_ssl_key_and_cert_file(
+        None, os.getenv(SSL_CERT_FILE_ENV_NAME)
+    )
+    assert key_file == None
+    assert cert_file == str(path)
 
-def test_validate_matlab_root_path_invalid_root_path(tmp_path):
-    """Checks if validate_matlab_root_path raises MatlabInstallError when non-existent path is supplied"""
-    # Arrange
-    matlab_root = Path(tmp_path) / "MATLAB"
-
-    # Act
-    with pytest.raises(MatlabInstallError):
-        actual_matlab_root = validate_matlab_root_path(
-            matlab_root, is_custom_matlab_root=False
+    # Verify that if KEY is provided, CERT must also be provided
+    with pytest.raises(FatalError) as e:
+        validators.validate_ssl_key_and_cert_file(
+            os.getenv(SSL_KEY_FILE_ENV_NAME), None
         )
-        actual_matlab_root_custom = validate_matlab_root_path(
-            matlab_root, is_custom_matlab_root=True
+
+    # Verify that KEY is valid file location
+    with pytest.raises(FatalError) as e:
+        validators.validate_ssl_key_and_cert_file(
+            "/file/does/not/exist", os.getenv(SSL_CERT_FILE_ENV_NAME)
         )
 
-        # Assert
-        assert actual_matlab_root is None
-        assert actual_matlab_root_custom is None
+    # Verify that KEY is valid file location
+    with pytest.raises(FatalError) as e:
+        validators.validate_ssl_key_and_cert_file(
+            os.getenv(SSL_KEY_FILE_ENV_NAME), "/file/does/not/exist"
+        )
 
 
-def test_validate_matlab_root_path_non_existent_versioninfo_file(tmp_path):
-    """Checks if validate_matlab_root_path does not raise any exceptions even if VersionInfo.xml file does not exist"""
+@pytest.mark.parametrize(
+    "is_custom_matlab_root", [False, True], ids=["default", "custom"]
+)
+@pytest.mark.parametrize(
+    "create_matlab_root, create_version_info_file",
+    [(True, True), (True, False), (False, False)],
+    ids=[
+        "Valid MATLAB root",
+        "MATLAB root without a VersionInfo.xml file",
+        "Non-existent MATLAB root",
+    ],
+)
+def test_validate_matlab_root_path(
+    tmp_path, is_custom_matlab_root, create_matlab_root, create_version_info_file
+):
+    """Checks that validate_matlab_root_path returns matlab_root when it contains a VersionInfo.xml file,
+    returns None when it does not, and raises MatlabInstallError when matlab_root does not exist.
+    """
     # Arrange
-    matlab_root = Path(tmp_path) / "MATLAB"
-    os.mkdir(matlab_root)
-
-    # Act
-    actual_matlab_root = validate_matlab_root_path(
-        matlab_root, is_custom_matlab_root=False
-    )
-    actual_matlab_root_custom = validate_matlab_root_path(
-        matlab_root, is_custom_matlab_root=True
+    matlab_root = tmp_path / "MATLAB"
+    if create_matlab_root:
+        matlab_root.mkdir()
+    if create_version_info_file:
+        (matlab_root / constants.VERSION_INFO_FILE_NAME).touch()
+
+    # Act & Assert
+    if not create_matlab_root:
+        with pytest.raises(MatlabInstallError):
+            validators.validate_matlab_root_path(matlab_root, is_custom_matlab_root)
+        return
+
+    expected_matlab_root = matlab_root if create_version_info_file else None
+    assert (
+        validators.validate_matlab_root_path(matlab_root, is_custom_matlab_root)
+        == expected_matlab_root
     )
 
-    # Assert
-    assert actual_matlab_root is None
-    assert actual_matlab_root_custom is None
-
 
 @pytest.mark.parametrize(
     "timeout, validated_timeout",
@@ -353,7 +292,7 @@ def test_validate_idle_timeout(timeout, validated_timeout):
     # Nothing to arrange
 
     # Act
-    actual_timeout = validate_idle_timeout(timeout)
+    actual_timeout = validators.validate_idle_timeout(timeout)
 
     # Assert
     assert actual_timeout == validated_timeout
@@ -52,8 +52,6 @@ def test_prettify():
 
 
 def test_get_child_processes_no_children_initially(mocker):
-    import time
-
     # Create mock processes
     mock_parent_process_psutil = mocker.MagicMock(spec=psutil.Process)
     mock_child_processes = [mocker.MagicMock(spec=psutil.Process) for _ in range(2)]
@@ -62,25 +60,22 @@ def test_get_child_processes_no_children_initially(mocker):
     mocker.patch("psutil.Process", return_value=mock_parent_process_psutil)
     mock_parent_process_psutil.is_running.return_value = True
 
-    # Function that changes the behavior of .children() after a delay
-    def children_side_effect(*args, **kwargs):
-        # Wait for a specific time to simulate delay in the child process being present
-        time.sleep(0.4)
-        return mock_child_processes
-
-    mock_parent_process_psutil.children.side_effect = children_side_effect
+    # The child processes only show up on the third call to .children() to simulate
+    # a delay in the child processes being created
+    mock_parent_process_psutil.children.side_effect = [[], [], mock_child_processes]
 
     # Create a mock for asyncio.subprocess.Process with a dummy pid
     parent_process = mocker.MagicMock(spec=asyncio.subprocess.Process)
     parent_process.pid = 12345
 
     # Call the function with the mocked parent process
-    child_processes = get_child_processes(parent_process)
+    child_processes = get_child_processes(parent_process, sleep_interval=0)
 
     # Assert that the return value is our list of mock child processes
     assert child_processes == mock_child_processes
 
     # Assert that is_running and children methods were called on the mock
+    assert mock_parent_process_psutil.children.call_count == 3
     mock_parent_process_psutil.children.assert_called_with(recursive=False)
 
 
@@ -97,7 +92,7 @@ def test_get_child_processes_no_children(mocker):
 
     # Call the function with the mocked parent process
     with pytest.raises(UIVisibleFatalError):
-        get_child_processes(parent_process)
+        get_child_processes(parent_process, sleep_interval=0)
 
 
 def test_get_child_processes_with_children(mocker):
@@ -142,14 +137,17 @@ def test_get_child_processes_parent_not_running(mocker):
 
 
 def test_get_caller_name():
-    """Test to check if caller name is not empty"""
+    """Test to check if get_caller_name returns the name of the function two levels above it"""
+
     # Arrange
+    def fn_which_needs_caller_name():
+        return util.get_caller_name()
 
     # Act
-    caller_name = util.get_caller_name()
+    caller_name = fn_which_needs_caller_name()
 
     # Assert
-    assert caller_name is not None
+    assert caller_name == "test_get_caller_name"
 
 
 @pytest.fixture